@@ -0,0 +1,30 @@
+"""Aquarium Game engine.
+
+Importing the package has no side effects: no window opens, no pygame
+subsystem starts and no sprite is decoded until a game needs it. Play
+with ``python -m aquarium`` or the pygame_fish.py launcher.
+
+Modules, lowest layer first: config (sizes, rates, colours), logs,
+assets (sprite frames, fonts, the window), sim (clock, timers, species,
+fish, seaweed), population (the numpy fish backend), render (profiler,
+render caches, buttons), game (AquariumGame), snapshots and offline
+(saving a tank and catching it up), loop (fixed-step ticks), session
+(record and replay) and app (the command line).
+"""
+from .config import FIXED_DT, FPS, SCREEN_HEIGHT, SCREEN_WIDTH
+from .logs import configure_logging, stop_logging
+from .assets import frame_cache, get_font
+from .sim import (
+    SPECIES, AutoFeedPlanner, EntityStore, Fish, FishGrid, PopulationStats, Seaweed, SeaweedIndex, SimClock,
+    Species, TimerScheduler,
+)
+from .population import FishPopulation, FishView
+from .render import FrameProfiler, merge_rects, text_cache, tile_cache
+from .game import AquariumGame
+from .snapshots import (
+    SnapshotWriter, capture_chunks, capture_snapshot, little_endian, load_snapshot, save_snapshot, snapshot_chunks,
+    write_snapshot,
+)
+from .offline import OfflineProgress
+from .loop import FixedStepLoop, SimulationThread
+from .session import SessionRecorder, SessionReplay
@@ -0,0 +1,182 @@
+"""Command-line entry point: windowed play, headless runs and replays."""
+import argparse
+import os
+import sys
+import time
+
+import pygame
+
+from .config import FIXED_DT, FPS
+from .logs import LOG_CATEGORIES, configure_logging, log
+from .assets import build_atlas
+from .game import AquariumGame
+from .snapshots import SnapshotWriter, capture_snapshot, load_snapshot, save_snapshot
+from .offline import OfflineProgress
+from .loop import FixedStepLoop, SimulationThread
+from .session import SessionRecorder, SessionReplay
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aquarium Game")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a window and exit")
+    parser.add_argument("--sim-seconds", type=float, default=3600.0,
+                        help="simulated seconds to run in headless mode")
+    parser.add_argument("--dt", type=float, default=FIXED_DT,
+                        help="fixed step size in headless mode")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="simulated seconds per wall-clock second")
+    parser.add_argument("--backend", choices=("objects", "numpy"), default="objects",
+                        help="per-object fish or the vectorized numpy population")
+    parser.add_argument("--avoidance", action="store_true",
+                        help="have crowded fish steer apart")
+    parser.add_argument("--profile-trace", metavar="PATH",
+                        help="record per-phase timings and write a Chrome trace here on exit")
+    parser.add_argument("--save", metavar="PATH",
+                        help="resume from this snapshot if it exists and save back to it")
+    parser.add_argument("--no-catch-up", dest="catch_up", action="store_false",
+                        help="don't simulate the time the tank was closed when resuming")
+    parser.add_argument("--autosave", type=float, default=30.0,
+                        help="wall-clock seconds between background autosaves (0 to disable)")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="repaint and flip the whole window every frame")
+    parser.add_argument("--sim-thread", action="store_true",
+                        help="run the simulation ticks on a worker thread, apart from rendering")
+    parser.add_argument("--seed", type=int,
+                        help="seed for the game's random stream (random if omitted)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record this session's frames and player actions for replay")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a recorded session (headless unless a window is wanted)")
+    parser.add_argument("--build-atlas", action="store_true",
+                        help="pack the sprite atlas into the user cache directory "
+                             "(AQUARIUM_CACHE_DIR overrides it) and exit")
+    parser.add_argument("--log-level", default="INFO",
+                        help="DEBUG, INFO, WARNING or ERROR")
+    parser.add_argument("--log-categories", default=",".join(LOG_CATEGORIES),
+                        help="comma-separated subset of " + ", ".join(LOG_CATEGORIES))
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_categories.split(","))
+
+    if args.build_atlas:
+        build_atlas()
+        return
+
+    def new_game(headless):
+        if args.save and os.path.exists(args.save):
+            game, saved_at = load_snapshot(args.save, headless=headless, backend=args.backend)
+            if args.seed is not None:
+                game.reseed(args.seed)
+            offline = max(0.0, time.time() - saved_at)
+            if args.catch_up and not game.is_paused:
+                start = time.perf_counter()
+                events = OfflineProgress(game).run(offline)
+                log.info("Resumed %s: caught up %.0fs offline in %.3fs (%d events)",
+                         args.save, offline, time.perf_counter() - start, events)
+            else:
+                log.info("Resumed %s, saved %.0fs ago", args.save, offline)
+            return game
+        return AquariumGame(headless=headless, backend=args.backend, seed=args.seed)
+
+    if args.replay:
+        replay = SessionReplay(args.replay, headless=args.headless)
+        game = replay.game
+        if args.profile_trace:
+            game.profiler.start_trace()
+        start = time.perf_counter()
+        running = True
+        while running and replay.step():
+            if not args.headless:
+                for event in pygame.event.get():
+                    running = running and event.type != pygame.QUIT
+                game.clock.tick(FPS)
+                pygame.display.update(game.draw(game.screen) if args.full_redraw else game.draw_dirty(game.screen))
+            elif game.profiler.enabled:
+                game.profiler.end_frame()
+        elapsed = time.perf_counter() - start
+        if args.profile_trace:
+            game.profiler.dump_trace(args.profile_trace)
+        print(f"Replayed {replay.frames} frames ({game.sim_clock.now:.0f}s) in {elapsed:.2f}s: "
+              f"{len(game.fish_list)} fish, {len(game.seaweed_list)} seaweed, {int(game.coins)} coins")
+        pygame.quit()
+        return
+
+    if args.headless:
+        game = new_game(headless=True)
+        game.time_scale = args.time_scale
+        game.fish_avoidance = args.avoidance
+        if args.profile_trace:
+            game.profiler.start_trace()
+        start = time.perf_counter()
+        game.run_for(args.sim_seconds, args.dt)
+        elapsed = time.perf_counter() - start
+        if args.profile_trace:
+            game.profiler.dump_trace(args.profile_trace)
+        if args.save:
+            save_snapshot(game, args.save)
+        print(f"Simulated {args.sim_seconds:.0f}s in {elapsed:.2f}s: "
+              f"{len(game.fish_list)} fish, {len(game.seaweed_list)} seaweed, {int(game.coins)} coins")
+        return
+
+    resumed = bool(args.save and os.path.exists(args.save))
+    game = new_game(headless=False)
+    game.time_scale = args.time_scale
+    game.fish_avoidance = args.avoidance
+    log.info("Game seed %d", game.seed)
+    recorder = None
+    if args.record:
+        # A resumed tank is replayed from a copy of its state at this point
+        snapshot = None
+        if resumed:
+            snapshot = args.record + ".start"
+            save_snapshot(game, snapshot)
+        game.reseed(game.seed)
+        recorder = SessionRecorder(args.record, game, snapshot)
+    if args.profile_trace:
+        game.profiler.start_trace()
+    screen = game.screen
+    clock = game.clock
+    writer = SnapshotWriter(args.save) if args.save else None
+    last_save = time.time()
+    loop = FixedStepLoop(game, recorder)
+    sim_thread = SimulationThread(loop) if args.sim_thread else None
+
+    running = True
+    while running:
+        frame_dt = clock.tick(FPS) / 1000.0
+        with loop.lock:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                game.handle_event(event)
+
+            if sim_thread is None:
+                loop.advance(frame_dt)
+            game.interpolation = loop.alpha()
+            if args.full_redraw:
+                rects = game.draw(screen)
+            else:
+                rects = game.draw_dirty(screen)
+            if game.profiler.enabled:
+                game.profiler.begin()
+                pygame.display.update(rects)
+                game.profiler.lap("flip")
+                game.profiler.end_frame()
+            else:
+                pygame.display.update(rects)
+
+            if writer and args.autosave > 0 and time.time() - last_save >= args.autosave:
+                writer.submit(capture_snapshot(game))
+                last_save = time.time()
+
+    if sim_thread:
+        sim_thread.stop()
+    if writer:
+        writer.submit(capture_snapshot(game))
+        writer.close()
+    if recorder:
+        recorder.close()
+    if args.profile_trace:
+        game.profiler.dump_trace(args.profile_trace)
+    pygame.quit()
+    sys.exit()
@@ -0,0 +1,355 @@
+"""Sprite frames, fonts and the display, each set up on first use."""
+import hashlib
+import json
+import math
+import os
+import sys
+
+import pygame
+
+from .config import MAX_FISH_ANGLE, POSE_ANGLE_STEP
+from .logs import log
+
+# Sprite folders live in assets/ beside the package, wherever it is run from
+ASSET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+
+def user_cache_dir():
+    """Where the game may write caches: AQUARIUM_CACHE_DIR if set, else the
+    platform's per-user cache directory, never the install tree"""
+    override = os.environ.get("AQUARIUM_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return os.path.join(base, "aquarium", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/aquarium")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "aquarium")
+
+
+# Packed sprite atlas: every frame of these folders at every stage size
+ATLAS_DIR = os.path.join(user_cache_dir(), "atlas")
+ATLAS_VERSION = 1
+ATLAS_FOLDERS = ("guppy_baby", "guppy", "guppy_female")
+ATLAS_STAGES = range(1, 6)
+
+
+# Shared sprite-frame cache
+class FrameCache:
+    """Process-wide store of decoded and scaled 3x3 animation grids.
+
+    Grids are keyed by (folder, size multiplier) so every fish of the same
+    folder and stage shares one set of Surfaces instead of reloading PNGs.
+    Packed folders come from the pre-scaled sprite atlas as subsurface
+    views, so the first lookup decodes one image for all of them; other
+    folders are loaded and scaled frame by frame.
+    Each frame also gets a pose atlas of flipped/unflipped rotations at
+    angle_step intervals, rendered on first use. Poses are what gets
+    blitted, so once a display exists they are converted to its format,
+    including any rendered before the window opened.
+    """
+
+    def __init__(self, angle_step=POSE_ANGLE_STEP, atlas_dir=ATLAS_DIR):
+        self.frames = {}
+        self.sources = {}
+        self.poses = {}
+        self.atlas_dir = atlas_dir
+        self.atlas = None
+        self.atlas_grids = None  # None until the atlas has been looked for
+        self.angle_step = angle_step
+        self.angle_slots = int(math.ceil(MAX_FISH_ANGLE / angle_step)) * 2 + 1
+        self.converted = False  # Whether poses are in the display's format
+
+    def set_angle_step(self, angle_step):
+        """Change the rotation resolution, dropping already rendered poses"""
+        self.angle_step = angle_step
+        self.angle_slots = int(math.ceil(MAX_FISH_ANGLE / angle_step)) * 2 + 1
+        self.poses = {}
+
+    def check_display(self):
+        """Convert the rendered poses the first time a display is open"""
+        if not self.converted and pygame.display.get_surface() is not None:
+            for slots in self.poses.values():
+                for i, image in enumerate(slots):
+                    if image is not None:
+                        slots[i] = image.convert_alpha()
+            self.converted = True
+        return self.converted
+
+    def pose(self, frame, flipped, angle):
+        """Return frame mirrored (if flipped) and rotated to the nearest step"""
+        converted = self.converted or self.check_display()
+        slots = self.poses.get(frame)
+        if slots is None:
+            slots = self.poses[frame] = [None] * (self.angle_slots * 2)
+        half = self.angle_slots // 2
+        index = min(max(int(round(angle / self.angle_step)) + half, 0), self.angle_slots - 1)
+        if flipped:
+            index += self.angle_slots
+        image = slots[index]
+        if image is None:
+            image = pygame.transform.flip(frame, flipped, False)
+            image = pygame.transform.rotate(image, (index % self.angle_slots - half) * self.angle_step)
+            if converted:
+                image = image.convert_alpha()
+            slots[index] = image
+        return image
+
+    def get(self, folder_name, size_multiplier):
+        key = (folder_name, size_multiplier)
+        frames = self.frames.get(key)
+        if frames is None:
+            frames = self.atlas_frames(key)
+            if frames is None:
+                size = frame_size(size_multiplier)
+                frames = [[pygame.transform.scale(frame, size) for frame in row]
+                          for row in self.load_sources(folder_name)]
+            self.frames[key] = frames
+        return frames
+
+    def atlas_frames(self, key):
+        """key's grid as subsurface views into the packed atlas, or None if it isn't packed"""
+        if self.atlas_grids is None:
+            loaded = load_atlas(self.atlas_dir)
+            self.atlas, self.atlas_grids = loaded if loaded is not None else (None, {})
+            if self.atlas is not None and pygame.display.get_surface() is not None:
+                self.atlas = self.atlas.convert_alpha()
+        rects = self.atlas_grids.get(key)
+        if rects is None:
+            return None
+        return [[self.atlas.subsurface(rect) for rect in row] for row in rects]
+
+    def load_sources(self, folder_name):
+        """Load unscaled animation frames from the specified folder once"""
+        sources = self.sources.get(folder_name)
+        if sources is not None:
+            return sources
+        try:
+            sources = []
+            for row in range(1, 4):
+                row_frames = []
+                for col in range(1, 4):
+                    frame_path = source_path(folder_name, row, col)
+                    if not os.path.exists(frame_path):
+                        log.warning("Frame not found: %s", frame_path)
+                        if row == 1 and col == 1:
+                            frame = pygame.Surface((50, 30), pygame.SRCALPHA)
+                            pygame.draw.rect(frame, (255, 165, 0), (0, 0, 50, 30))
+                        else:
+                            frame = sources[0][0] if sources else pygame.Surface((50, 30), pygame.SRCALPHA)
+                    else:
+                        frame = pygame.image.load(frame_path)
+                        # Headless games have no display to convert against
+                        if pygame.display.get_surface() is not None:
+                            frame = frame.convert_alpha()
+                    row_frames.append(frame)
+                sources.append(row_frames)
+        except Exception as e:
+            log.error("Error loading %s images: %s", folder_name, e)
+            fallback = pygame.Surface((50, 30), pygame.SRCALPHA)
+            pygame.draw.rect(fallback, (255, 165, 0), (0, 0, 50, 30))
+            sources = [[fallback for _ in range(3)] for _ in range(3)]
+        self.sources[folder_name] = sources
+        return sources
+
+    def warm(self, folders=ATLAS_FOLDERS, stages=ATLAS_STAGES, poses=False):
+        """Decode every folder/stage combination up front, optionally baking all poses"""
+        half = self.angle_slots // 2
+        for folder_name in folders:
+            for stage in stages:
+                frames = self.get(folder_name, stage_size_multiplier(stage))
+                if not poses:
+                    continue
+                for row in frames:
+                    for frame in row:
+                        for slot in range(-half, half + 1):
+                            self.pose(frame, False, slot * self.angle_step)
+                            self.pose(frame, True, slot * self.angle_step)
+
+    def evict(self, folder_name=None, size_multiplier=None):
+        """Drop cached grids matching the folder and/or size multiplier"""
+        for key in list(self.frames):
+            if folder_name is not None and key[0] != folder_name:
+                continue
+            if size_multiplier is not None and key[1] != size_multiplier:
+                continue
+            for row in self.frames.pop(key):
+                for frame in row:
+                    self.poses.pop(frame, None)
+        if size_multiplier is None:
+            for key in list(self.sources):
+                if folder_name is None or key == folder_name:
+                    del self.sources[key]
+        if folder_name is None and size_multiplier is None:
+            # Reread the atlas next time, in case it was rebuilt meanwhile
+            self.atlas = None
+            self.atlas_grids = None
+
+
+def stage_size_multiplier(stage):
+    return 1.0 + (stage - 1) * 0.2
+
+
+def frame_size(size_multiplier):
+    return int(50 * size_multiplier), int(30 * size_multiplier)
+
+
+def source_path(folder_name, row, col):
+    return os.path.join(ASSET_DIR, folder_name, f"row-{row}-column-{col}.png")
+
+
+def source_fingerprint(path, known=None):
+    """[size, mtime_ns, content hash] of a source file.
+
+    When size and mtime still match known, known is returned without
+    reading the file; otherwise the content is hashed, so a touched but
+    unchanged file keeps its hash.
+    """
+    stat = os.stat(path)
+    if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return known
+    with open(path, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    return [stat.st_size, stat.st_mtime_ns, digest]
+
+
+def pack_atlas():
+    """Scale and pack every ATLAS_FOLDERS frame at every ATLAS_STAGES size.
+
+    Frames are scaled exactly as FrameCache.get would scale them. Each
+    folder gets a column of 3x3 grids and each stage a band of rows, so
+    the atlas is one small image. Returns (surface, index); the index
+    lists every grid's frame rects and fingerprints the source PNGs.
+    """
+    sources = {}
+    grids = {}
+    for folder_name in ATLAS_FOLDERS:
+        grids[folder_name] = []
+        for row in range(1, 4):
+            row_frames = []
+            for col in range(1, 4):
+                path = source_path(folder_name, row, col)
+                sources[os.path.relpath(path, ASSET_DIR)] = source_fingerprint(path)
+                row_frames.append(pygame.image.load(path))
+            grids[folder_name].append(row_frames)
+
+    sizes = [frame_size(stage_size_multiplier(stage)) for stage in ATLAS_STAGES]
+    column_width = 3 * max(width for width, height in sizes)
+    atlas = pygame.Surface((column_width * len(ATLAS_FOLDERS), sum(3 * height for width, height in sizes)),
+                           pygame.SRCALPHA)
+    entries = []
+    y = 0
+    for stage, (width, height) in zip(ATLAS_STAGES, sizes):
+        for i, folder_name in enumerate(ATLAS_FOLDERS):
+            rects = []
+            for row, row_frames in enumerate(grids[folder_name]):
+                rects.append([])
+                for col, frame in enumerate(row_frames):
+                    rect = [i * column_width + col * width, y + row * height, width, height]
+                    # RGBA_MAX onto the clear atlas copies pixels instead of alpha blending them
+                    atlas.blit(pygame.transform.scale(frame, (width, height)), rect[:2],
+                               special_flags=pygame.BLEND_RGBA_MAX)
+                    rects[-1].append(rect)
+            entries.append({"folder": folder_name, "multiplier": stage_size_multiplier(stage), "rects": rects})
+        y += 3 * height
+    return atlas, {"version": ATLAS_VERSION, "sources": sources, "grids": entries}
+
+
+def save_atlas(atlas_dir, atlas, index):
+    """Write atlas.png and atlas.json, dropping the old index first so a
+    half-written cache is never mistaken for a current one"""
+    os.makedirs(atlas_dir, exist_ok=True)
+    index_path = os.path.join(atlas_dir, "atlas.json")
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    image_path = os.path.join(atlas_dir, "atlas.png")
+    pygame.image.save(atlas, image_path + ".tmp.png")
+    os.replace(image_path + ".tmp.png", image_path)
+    with open(index_path + ".tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(index_path + ".tmp", index_path)
+
+
+def atlas_is_current(index):
+    """Whether index was packed by this version from the source PNGs as they are now"""
+    expected = {(folder_name, stage_size_multiplier(stage)) for folder_name in ATLAS_FOLDERS for stage in ATLAS_STAGES}
+    if index.get("version") != ATLAS_VERSION or {(g["folder"], g["multiplier"]) for g in index["grids"]} != expected:
+        return False
+    sources = index["sources"]
+    paths = {os.path.relpath(source_path(folder_name, row, col), ASSET_DIR)
+             for folder_name in ATLAS_FOLDERS for row in range(1, 4) for col in range(1, 4)}
+    if set(sources) != paths:
+        return False
+    return all(source_fingerprint(os.path.join(ASSET_DIR, path), known)[2] == known[2]
+               for path, known in sources.items())
+
+
+def build_atlas(atlas_dir=ATLAS_DIR):
+    """Pack the atlas and store it in atlas_dir; returns (surface, index)"""
+    atlas, index = pack_atlas()
+    save_atlas(atlas_dir, atlas, index)
+    log.info("Packed sprite atlas %dx%d into %s", atlas.get_width(), atlas.get_height(), atlas_dir)
+    return atlas, index
+
+
+def load_atlas(atlas_dir=ATLAS_DIR):
+    """The cached atlas as (surface, {(folder, multiplier): rects}), rebuilt first if stale.
+
+    Returns None when the atlas can't be packed, e.g. a source frame is
+    missing; FrameCache then loads and scales frames one by one.
+    """
+    index = None
+    try:
+        with open(os.path.join(atlas_dir, "atlas.json")) as f:
+            index = json.load(f)
+        if atlas_is_current(index):
+            atlas = pygame.image.load(os.path.join(atlas_dir, "atlas.png"))
+        else:
+            index = None
+    except (OSError, ValueError, KeyError, TypeError, pygame.error):
+        index = None
+    if index is None:
+        try:
+            atlas, index = pack_atlas()
+        except (OSError, pygame.error) as e:
+            log.warning("Sprite atlas unavailable, loading frames individually: %s", e)
+            return None
+        try:
+            save_atlas(atlas_dir, atlas, index)
+            log.info("Packed sprite atlas %dx%d into %s", atlas.get_width(), atlas.get_height(), atlas_dir)
+        except (OSError, pygame.error) as e:
+            log.warning("Could not cache the sprite atlas in %s: %s", atlas_dir, e)
+    grids = {(grid["folder"], grid["multiplier"]): [[pygame.Rect(rect) for rect in row] for row in grid["rects"]]
+             for grid in index["grids"]}
+    return atlas, grids
+
+
+frame_cache = FrameCache()
+
+
+# Display and fonts
+_fonts = {}
+
+
+def get_font(size):
+    """The default font at size, starting pygame.font on first use"""
+    font = _fonts.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+
+def open_window(size, caption):
+    """Open the game window, starting only the display subsystem.
+
+    pygame.init() would also bring up audio, joysticks and the rest, none
+    of which the game uses, and probing the audio device alone can stall
+    a cold start.
+    """
+    pygame.display.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(caption)
+    return screen
@@ -0,0 +1,36 @@
+"""Screen size, simulation rates, tuning constants and colours."""
+import pygame
+
+
+# Constants
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+FPS = 60
+FIXED_DT = 1.0 / FPS  # Seconds per simulation step
+TICK_BUDGET = 0.05  # Wall seconds of ticks per frame before a slow frame slows the simulation down instead
+FISH_SPEED = 3
+VISITOR_UPDATE_INTERVAL = 1.0  # Seconds
+HUNGER_CHECK_INTERVAL = 10.0  # Seconds
+FISH_BREED_AGE = 20.0  # Seconds
+MAX_FISH_ANGLE = 30  # Degrees either side of horizontal
+POSE_ANGLE_STEP = 2  # Degrees between pre-rendered rotations
+SEAWEED_CELL_SIZE = 64  # Pixels per seaweed index grid cell
+AVOID_RADIUS = 40  # Fish centers closer than this steer apart when avoidance is on
+FISH_CELL_SIZE = AVOID_RADIUS  # Pixels per fish broad-phase grid cell: one ring covers an avoidance check
+AVOID_STRENGTH = 0.05  # Speed change per 60 Hz tick between two fish at the same spot
+POOL_SIZE = 256  # Removed fish or seaweed kept for reuse
+
+# Screen regions the dirty-rect renderer treats as one unit
+HUD_AREA = pygame.Rect(0, 0, SCREEN_WIDTH // 2, 210)  # Stats lines
+BUTTON_AREA = pygame.Rect(SCREEN_WIDTH - 200, 10, 190, 240)  # Top-right buttons
+HUD_OVERLAY_POS = (10, 210)  # Profiler overlay, just below the stats
+MAX_DAMAGED_RECTS = 2000  # Past this many the dirty renderer merges for longer than a full redraw takes
+
+# Colors
+BLUE = (0, 105, 148)  # Aquarium background
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GRAY = (150, 150, 150)
+YELLOW = (255, 215, 0)
+GREEN = (50, 205, 50)
+RED = (255, 0, 0)
@@ -0,0 +1,1121 @@
+"""The aquarium game: simulation update, drawing and input."""
+import math
+import random
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # Only the numpy fish backend needs it
+    np = None
+
+from .config import (
+    AVOID_RADIUS,
+    AVOID_STRENGTH,
+    BLACK,
+    BLUE,
+    BUTTON_AREA,
+    FISH_SPEED,
+    FIXED_DT,
+    GREEN,
+    HUD_AREA,
+    HUD_OVERLAY_POS,
+    MAX_DAMAGED_RECTS,
+    RED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    WHITE,
+)
+from .logs import debug_log, log_breeding, log_economy, log_hunger
+from .assets import get_font, open_window
+from .sim import (
+    AutoFeedPlanner, EntityStore, Fish, FishGrid, PopulationStats, SPECIES, Seaweed, SeaweedIndex, SimClock,
+    TimerScheduler,
+)
+from .population import FishPopulation
+from .render import BreedButton, Button, FrameProfiler, merge_rects, text_cache, tile_cache
+
+
+# Game class
+class AquariumGame:
+    def __init__(self, headless=False, sim_clock=None, backend="objects", seed=None):
+        self.headless = headless
+        self.sim_clock = sim_clock or SimClock()
+        # Every random draw in the simulation comes from this stream
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.recorder = None
+        if headless:
+            # Simulation only: no window or clock, never drawn
+            self.screen = None
+            self.clock = None
+        else:
+            self.screen = open_window((SCREEN_WIDTH, SCREEN_HEIGHT), "Aquarium Game")
+            self.clock = pygame.time.Clock()
+        # Sprite frames load when the first fish that needs them is created
+        self.coins = 200
+        # "numpy" keeps fish state in arrays and advances it in batches
+        self.population = FishPopulation(self) if backend == "numpy" else None
+        # Numpy fish are array rows, so only Fish objects are pooled
+        self.fish_list = EntityStore(pool_size=0) if self.population is not None else EntityStore()
+        self.population_stats = PopulationStats()
+        self.starved = 0  # Fish lost to hunger this session
+        self.timers = TimerScheduler(self)
+        self.seaweed_list = EntityStore()
+        self.seaweed_index = SeaweedIndex()
+        self.fish_grid = FishGrid()
+        # Opt-in: crowded fish steer apart each tick
+        self.fish_avoidance = False
+        self.shop_items = {
+            "Guppy": 8,
+            "Seaweed": 3,
+        }
+        self.selected_item = None
+        self.is_selling_mode = False
+        self.fish_to_sell = []
+        self.visitor_count = 0
+        self.visitor_income_rate = 0.1
+        self.last_visitor_update = 0.0
+        self.seaweed_areas = [(100, 100), (200, 400), (600, 150), (700, 450), (400, 200)]
+        self.current_area = 0
+        self.shop_open = False
+        self.sell_menu_open = False
+        self.fish_details_open = False
+        self.selected_fish = None
+        self.auto_feed = False
+        self.feed_planner = AutoFeedPlanner(self)
+        self.show_hunger_bar = True
+        self.settings_open = False
+        self.is_paused = False
+        self.time_scale = 1.0
+        self.selected_fish_1 = None
+        self.selected_fish_2 = None
+        self.breeding_in_progress = False
+        self.profiler = FrameProfiler()
+        self.hud_lines = [(None, None)] * 5
+        # Dirty-rect renderer state: what each fish looked like when last
+        # drawn, plus regions damaged outside draw (seaweed added/removed)
+        self.drawn_fish = {}
+        self.drawn_buttons = None
+        self.drawn_overlay = None
+        self.damaged_rects = []
+        self.needs_full_redraw = True
+        # Fish centers before the latest tick, and how far between that
+        # tick and the next to draw them (1.0 draws the latest tick)
+        self.previous_centers = {}
+        self.interpolation = 1.0
+        self.shop_button = Button(SCREEN_WIDTH - 100, 10, 90, 40, "Shop")
+        self.breed_button = BreedButton(SCREEN_WIDTH - 100, 210)
+        self.settings_button = Button(SCREEN_WIDTH - 100, 60, 90, 40, "Settings")
+        self.pause_button = Button(SCREEN_WIDTH - 100, 110, 90, 40, "Pause")
+        self.speed_1x_button = Button(SCREEN_WIDTH - 100, 160, 50, 40, "1x")
+        self.speed_3x_button = Button(SCREEN_WIDTH - 150, 160, 50, 40, "3x")
+        self.speed_6x_button = Button(SCREEN_WIDTH - 200, 160, 50, 40, "6x")
+        self.seaweed_quantity_prompt = False
+        self.seaweed_quantity_input = ""
+        self.confirm_button = Button(360, 370, 90, 40, "Confirm")
+        self.cancel_button = Button(460, 370, 90, 40, "Cancel")
+        self.guppy_btn = None
+        self.seaweed_btn = None
+        self.sell_mode_btn = None
+        self.close_btn = None
+        self.auto_feed_btn = None
+
+    @property
+    def font(self):
+        """HUD and menu font, opened on first draw"""
+        return get_font(36)
+
+    def update(self, dt):
+        if self.is_paused:
+            return
+
+        scaled_dt = max(dt * self.time_scale, 0.001)
+        self.sim_clock.advance(scaled_dt)
+        profiler = self.profiler
+        profiling = profiler.enabled
+        if profiling:
+            profiler.begin()
+
+        if self.population is not None:
+            self.update_population(scaled_dt, profiling)
+            return
+
+        # Fire due timers: hunger thresholds, cooldowns, births, courtships
+        timers = self.timers
+        timers.run(self.sim_clock.now)
+
+        # Check for death due to hunger
+        if timers.starving and not self.seaweed_list:
+            for fish in list(timers.starving):
+                log_hunger.info("Fish ID %d should die: Hunger %.1f", fish.id, fish.hunger)
+                self.remove_fish(fish)
+                self.coins = max(0, self.coins - 5)
+                self.starved += 1
+        if profiling:
+            profiler.lap("timers")
+
+        if self.fish_avoidance:
+            self.avoid_neighbours(scaled_dt)
+            if profiling:
+                profiler.lap("avoidance")
+
+        # Update fish. Nothing in the loop adds or removes fish, so it
+        # walks fish_list itself rather than a copy
+        index = self.seaweed_index
+        for fish in self.fish_list:
+            # Hungry fish keep their seaweed until it goes or they swim into another cell
+            if fish in timers.hungry and self.seaweed_list:
+                if fish.target_seaweed is None:
+                    index.retarget(fish, index.nearest(fish.rect.centerx, fish.rect.centery))
+                fish.is_hungry = True
+            else:
+                index.retarget(fish, None)
+                fish.is_hungry = False
+            if profiling:
+                profiler.lap("targeting")
+
+            if fish.target_seaweed is None:
+                fish.update(scaled_dt)
+            else:
+                cell = index.cell_of(fish.rect.centerx, fish.rect.centery)
+                fish.update(scaled_dt)
+                if index.cell_of(fish.rect.centerx, fish.rect.centery) != cell:
+                    index.retarget(fish, None)
+            if profiling:
+                profiler.lap("fish_update")
+
+            # Check for seaweed collisions
+            seaweed = fish not in timers.digesting and self.seaweed_index.colliding(fish.rect.inflate(20, 20))
+            if seaweed and (fish.is_hungry or not seaweed.reserved) and fish.eat_seaweed(seaweed):
+                self.remove_seaweed(seaweed)
+                self.seaweed_index.retarget(fish, None)
+                if debug_log.hunger:
+                    next_food_needed = sum(fish.food_needed[:fish.stage])
+                    log_hunger.debug("Fish ID %d ate seaweed! Type: %s, Stage: %d, Food eaten: %d/%d",
+                                     fish.id, fish.type, fish.stage, fish.food_eaten, next_food_needed)
+            if profiling:
+                profiler.lap("collisions")
+
+            # Check for breeding collisions
+            if self.breeding_in_progress and fish.breeding_partner:
+                dx = fish.rect.centerx - fish.breeding_partner.rect.centerx
+                dy = fish.rect.centery - fish.breeding_partner.rect.centery
+                distance = math.hypot(dx, dy)
+                if distance <= 50:
+                    fish.collide_with_fish(fish.breeding_partner)
+            if profiling:
+                profiler.lap("breeding")
+        self.fish_grid.invalidate()
+
+        # Update coins
+        self.coins += self.income_rate() * scaled_dt
+        if profiling:
+            profiler.lap("income")
+
+        if self.auto_feed:
+            self.feed_planner.update(self.sim_clock.now, scaled_dt)
+        if profiling:
+            profiler.lap("auto_feed")
+        self.release_removed()
+
+    def update_population(self, scaled_dt, profiling=False):
+        """update() for the numpy backend: batched step plus per-fish work on the few rows that need it"""
+        pop = self.population
+        profiler = self.profiler
+        now = self.sim_clock.now
+
+        # Check for death due to hunger
+        if not self.seaweed_list:
+            for slot in np.flatnonzero(pop.column("hunger") >= 150)[::-1]:
+                fish = pop.views[slot]
+                log_hunger.info("Fish ID %d should die: Hunger %.1f", fish.id, fish.hunger)
+                self.remove_fish(fish)
+                self.coins = max(0, self.coins - 5)
+                self.starved += 1
+        if profiling:
+            profiler.lap("deaths")
+
+        # Feeding and targeting: hungry fish keep their seaweed until it
+        # goes or they swim into another cell, as in update()
+        index = self.seaweed_index
+        if self.seaweed_list:
+            hungry = pop.column("hunger") > 30
+            pop.choose_targets(np.flatnonzero(hungry & ~pop.column("has_target")), index,
+                               self.seaweed_list.in_order())
+        else:
+            hungry = np.zeros(pop.size, bool)
+        for slot in np.flatnonzero(~hungry & pop.column("has_target")):
+            index.retarget(pop.views[slot], None)
+        pop.column("is_hungry")[:] = hungry
+        if profiling:
+            profiler.lap("targeting")
+
+        # Handle breeding movement
+        breeding = [pop.views[slot] for slot in np.flatnonzero(pop.breeding_mask())]
+        for fish in breeding:
+            # Finishing one fish clears its partner's state too
+            if fish.breeding_partner:
+                if now - fish.collision_start_time >= fish.required_collision_time:
+                    fish.finish_breeding()
+                else:
+                    fish.update_breeding()
+
+        if profiling:
+            profiler.lap("breeding")
+
+        if self.fish_avoidance:
+            self.avoid_neighbours(scaled_dt)
+            if profiling:
+                profiler.lap("avoidance")
+
+        cells = pop.cells(index.cell_size)
+        pop.step(scaled_dt, now)
+        moved = pop.column("has_target") & (pop.cells(index.cell_size) != cells).any(axis=0)
+        for slot in np.flatnonzero(moved):
+            index.retarget(pop.views[slot], None)
+        self.fish_grid.invalidate()
+        if profiling:
+            profiler.lap("fish_update")
+
+        # Check for seaweed collisions
+        if self.seaweed_list:
+            # A coarse filter; eat_seaweed checks each fish's own cooldown
+            cooldown = min(species.eat_cooldown for species in SPECIES.values())
+            ready = now - pop.column("last_eat_time") >= cooldown
+            for slot in np.flatnonzero(ready & pop.near_seaweed(self.seaweed_index)):
+                fish = pop.views[slot]
+                seaweed = self.seaweed_index.colliding(fish.rect.inflate(20, 20))
+                if seaweed and (fish.is_hungry or not seaweed.reserved) and fish.eat_seaweed(seaweed):
+                    self.remove_seaweed(seaweed)
+                    self.seaweed_index.retarget(fish, None)
+        if profiling:
+            profiler.lap("collisions")
+
+        # Check for breeding collisions
+        if self.breeding_in_progress:
+            for slot in np.flatnonzero(pop.column("has_partner")):
+                fish = pop.views[slot]
+                partner = fish.breeding_partner
+                if partner and math.hypot(fish.rect.centerx - partner.rect.centerx,
+                                          fish.rect.centery - partner.rect.centery) <= 50:
+                    fish.collide_with_fish(partner)
+
+        # Spawn babies
+        due = (pop.column("is_female") & pop.column("is_fertilized") &
+               (pop.column("breed_timer") <= 0) & (pop.column("stage") == 5))
+        for fish in [pop.views[slot] for slot in np.flatnonzero(due)]:
+            for baby in fish.spawn_babies():
+                self.add_fish(baby)
+        if profiling:
+            profiler.lap("breeding")
+
+        # Update coins
+        self.coins += self.income_rate() * scaled_dt
+        if profiling:
+            profiler.lap("income")
+
+        if self.auto_feed:
+            self.feed_planner.update(now, scaled_dt)
+        if profiling:
+            profiler.lap("auto_feed")
+        self.release_removed()
+
+    def release_removed(self):
+        """End of tick: fish and seaweed removed since the last one become reusable"""
+        self.fish_list.release()
+        self.seaweed_list.release()
+
+    def current_fish_grid(self):
+        """self.fish_grid, rebuilt first if fish moved, arrived or left since the last build"""
+        grid = self.fish_grid
+        if grid.stale:
+            grid.rebuild(self.fish_list.in_order())
+        return grid
+
+    def fish_at(self, pos):
+        """The first fish in draw order whose rect contains pos, or None"""
+        return self.current_fish_grid().pick(*pos)
+
+    def avoid_neighbours(self, scaled_dt):
+        """Nudge apart fish whose centers are closer than AVOID_RADIUS.
+
+        The push grows as the gap shrinks and is added to both fish's
+        speed, capped at FISH_SPEED. Courting pairs are left to meet.
+        """
+        push = AVOID_STRENGTH * 60 * scaled_dt / AVOID_RADIUS
+        nudges = {}
+        for a, b, dx, dy in self.current_fish_grid().pairs(AVOID_RADIUS):
+            if a.breeding_partner is b:
+                continue
+            distance = math.hypot(dx, dy)
+            if distance == 0:
+                # Stacked fish (a fresh purchase lands on the last one) part sideways
+                dx, distance = 1, 1
+            strength = (AVOID_RADIUS - distance) * push / distance
+            dx *= strength
+            dy *= strength
+            nudge = nudges.get(a)
+            nudges[a] = (-dx, -dy) if nudge is None else (nudge[0] - dx, nudge[1] - dy)
+            nudge = nudges.get(b)
+            nudges[b] = (dx, dy) if nudge is None else (nudge[0] + dx, nudge[1] + dy)
+        for fish, (dx, dy) in nudges.items():
+            speed_x = fish.speed_x + dx
+            speed_y = fish.speed_y + dy
+            speed = math.hypot(speed_x, speed_y)
+            if speed > FISH_SPEED:
+                speed_x *= FISH_SPEED / speed
+                speed_y *= FISH_SPEED / speed
+            fish.speed_x = speed_x
+            fish.speed_y = speed_y
+
+    def income_rate(self):
+        """Coins per simulated second from the current population"""
+        return self.population_stats.income_rate
+
+    def step(self, n=1, dt=FIXED_DT):
+        """Advance the simulation n fixed steps of dt wall seconds each"""
+        for _ in range(n):
+            self.update(dt)
+            if self.profiler.enabled:
+                self.profiler.end_frame()
+
+    def run_for(self, sim_seconds, dt=FIXED_DT):
+        """Advance roughly sim_seconds of simulated time at the current time_scale"""
+        step_seconds = max(dt * self.time_scale, 0.001)
+        self.step(int(math.ceil(sim_seconds / step_seconds)), dt)
+
+    def draw(self, surface):
+        """Full redraw of the tank; returns the rects to push to the display"""
+        profiler = self.profiler
+        profiling = profiler.enabled
+        if profiling:
+            profiler.begin()
+        surface.fill(BLUE)
+        if profiling:
+            profiler.lap("background")
+
+        if self.population is not None:
+            looks = self.population_looks()
+        else:
+            looks = {fish: self.fish_look(fish) for fish in self.fish_list}
+        if profiling:
+            profiler.lap("fish_looks")
+        self.draw_layers(surface, looks)
+        if profiling:
+            profiler.lap("sprites")
+
+        self.refresh_buttons()
+        self.draw_buttons(surface)
+        self.draw_selection(surface)
+        if profiling:
+            profiler.lap("buttons")
+
+        self.draw_stats(surface, self.hud_stats())
+        if profiling:
+            profiler.lap("stats")
+
+        self.draw_menus(surface)
+        if profiling:
+            profiler.lap("menus")
+        if profiler.show_overlay:
+            profiler.draw_overlay(surface, *HUD_OVERLAY_POS)
+            if profiling:
+                profiler.lap("overlay")
+
+        # Remember what is on screen so the next draw_dirty has a baseline
+        self.drawn_fish = looks
+        self.drawn_buttons = self.button_look()
+        self.drawn_overlay = profiler.overlay_rect(*HUD_OVERLAY_POS) if profiler.show_overlay else None
+        self.damaged_rects = []
+        self.needs_full_redraw = self.menu_open()
+        return [surface.get_rect()]
+
+    def draw_dirty(self, surface):
+        """Redraw only the regions that changed since the last frame.
+
+        Every fish whose position, pose, label or selection changed damages
+        both its old and new extent, as do changed HUD lines and buttons.
+        The damaged rects are merged until disjoint, filled with the
+        background, and each layer is redrawn clipped to the rects it
+        touches, one Surface.blits call per layer and rect. Returns the
+        rects to pass to pygame.display.update. Menus fall back to a full
+        redraw while they are open, as does damage past MAX_DAMAGED_RECTS.
+        """
+        if self.needs_full_redraw or self.menu_open():
+            return self.draw(surface)
+        profiler = self.profiler
+        profiling = profiler.enabled
+        if profiling:
+            profiler.begin()
+
+        damaged = self.damaged_rects
+        self.damaged_rects = []
+        drawn_fish = self.drawn_fish
+        if self.population is not None:
+            looks = self.population_looks()
+            damaged.extend(self.population_damage(looks, drawn_fish))
+        else:
+            looks = {}
+            for fish in self.fish_list:
+                look = self.fish_look(fish)
+                looks[fish] = look
+                old = drawn_fish.pop(fish, None)
+                if old != look:
+                    damaged.append(look[0])
+                    if old is not None:
+                        damaged.append(old[0])
+            # Whatever is left was removed since the last frame
+            damaged.extend(look[0] for look in drawn_fish.values())
+        self.drawn_fish = looks
+
+        self.refresh_buttons()
+        buttons = self.button_look()
+        if buttons != self.drawn_buttons:
+            damaged.append(BUTTON_AREA)
+            self.drawn_buttons = buttons
+
+        stats = self.hud_stats()
+        for i, stat in enumerate(stats):
+            old_text, old_surface = self.hud_lines[i]
+            if old_text != stat:
+                y = 10 + i * 40
+                if old_surface is not None:
+                    damaged.append(old_surface.get_rect(topleft=(10, y)))
+                damaged.append(text_cache.render(self.font, stat, WHITE).get_rect(topleft=(10, y)))
+
+        overlay = profiler.overlay_rect(*HUD_OVERLAY_POS) if profiler.show_overlay else None
+        if self.drawn_overlay is not None:
+            damaged.append(self.drawn_overlay)
+        if overlay is not None:
+            damaged.append(overlay)
+        self.drawn_overlay = overlay
+
+        if len(damaged) > MAX_DAMAGED_RECTS:
+            return self.draw(surface)
+        dirty = merge_rects(damaged, surface.get_rect())
+        if not dirty:
+            return dirty
+        for rect in dirty:
+            surface.fill(BLUE, rect)
+        if profiling:
+            profiler.lap("background")
+
+        self.draw_layers(surface, looks, dirty)
+        if profiling:
+            profiler.lap("sprites")
+
+        for rect in dirty:
+            # The HUD layer is cheap to draw but there is no need to
+            # touch it for rects out in open water
+            if not (rect.colliderect(HUD_AREA) or rect.colliderect(BUTTON_AREA) or
+                    (overlay is not None and rect.colliderect(overlay)) or
+                    any(fish is not None and rect.colliderect(self.draw_rect(fish))
+                        for fish in (self.selected_fish_1, self.selected_fish_2))):
+                continue
+            surface.set_clip(rect)
+            self.draw_buttons(surface)
+            self.draw_selection(surface)
+            self.draw_stats(surface, stats)
+            if overlay is not None:
+                profiler.draw_overlay(surface, *HUD_OVERLAY_POS)
+        surface.set_clip(None)
+        if profiling:
+            profiler.lap("buttons")
+        return dirty
+
+    def menu_open(self):
+        return (self.shop_open or self.sell_menu_open or self.settings_open or
+                (self.fish_details_open and self.selected_fish is not None))
+
+    def remember_centers(self):
+        """Note where every fish is before a tick, for draw_rect to start from"""
+        if self.population is not None:
+            self.population.remember_centers()
+        else:
+            self.previous_centers = {fish: fish.rect.center for fish in self.fish_list}
+
+    def draw_rect(self, fish):
+        """fish.rect placed between the last two ticks by self.interpolation"""
+        rect = fish.rect
+        if self.population is not None:
+            previous = fish.previous_center
+        else:
+            previous = self.previous_centers.get(fish)
+        if previous is None or self.interpolation >= 1.0:
+            return rect
+        lag = 1.0 - self.interpolation
+        x, y = rect.center
+        return rect.move(round((previous[0] - x) * lag), round((previous[1] - y) * lag))
+
+    def fish_look(self, fish):
+        """(extent, rect, image, label, selected) for one fish as it would be drawn"""
+        rect = self.draw_rect(fish)
+        image = fish.image
+        extent = image.get_rect(center=rect.center).union(rect) if image else rect.copy()
+        if self.is_selling_mode:
+            label = self.price_tag(fish.stage)
+            extent.union_ip(label.get_rect(topleft=(rect.centerx - 10, rect.top - 20)))
+        elif self.show_hunger_bar:
+            label = self.hunger_bar(fish)
+            extent.union_ip((rect.x, rect.y - 7, rect.width, 3))
+        else:
+            label = None
+        selected = fish is self.selected_fish_1 or fish is self.selected_fish_2
+        return extent, rect, image, label, selected
+
+    def price_tag(self, stage):
+        sell_price = 3 * (1.0 + (stage - 1) * 0.4)
+        return text_cache.render(self.font, f"${sell_price:.1f}", WHITE)
+
+    def hunger_bar(self, fish):
+        max_hunger = 120
+        hunger_ratio = 1 - (min(fish.hunger, max_hunger) / max_hunger)
+        bar_width = int(fish.rect.width * hunger_ratio)
+        bar_color = (0, 255, 0) if hunger_ratio > 0.5 else (255, 255, 0) if hunger_ratio > 0.25 else (255, 0, 0)
+        return bar_width, bar_color
+
+    def population_looks(self):
+        """fish_look for every numpy row at once, in id order.
+
+        Returns (ids, keys, fish_items, label_items). Each keys row holds
+        what fish_look compares between frames, starting with the extent
+        as x, y, width, height; the item lists are ready for Surface.blits,
+        with None for fish that have no label to draw.
+        """
+        pop = self.population
+        col = pop.column
+        order = np.argsort(col("id"), kind="stable")
+        ids = col("id")[order]
+        left, top = col("left")[order].astype(int), col("top")[order].astype(int)
+        width, height = col("width")[order].astype(int), col("height")[order].astype(int)
+        if self.interpolation < 1.0:
+            # draw_rect, row by row: lag behind toward the previous center
+            lag = 1.0 - self.interpolation
+            tween = col("tween")[order]
+            left = left + np.where(tween, np.round((col("previous_x")[order] - (left + width // 2)) * lag), 0).astype(int)
+            top = top + np.where(tween, np.round((col("previous_y")[order] - (top + height // 2)) * lag), 0).astype(int)
+        centerx, centery = left + width // 2, top + height // 2
+        poses = pop.poses()[order]
+        pose_images = pop.current_pose_images()
+        sizes = pop.pose_sizes.reshape(-1, 2)[poses].astype(int)
+        image_x, image_y = centerx - sizes[:, 0] // 2, centery - sizes[:, 1] // 2
+        fish_items = list(zip([pose_images[pose] for pose in poses.tolist()], zip(image_x.tolist(), image_y.tolist())))
+        x0, y0 = np.minimum(image_x, left), np.minimum(image_y, top)
+        x1 = np.maximum(image_x + sizes[:, 0], left + width)
+        y1 = np.maximum(image_y + sizes[:, 1], top + height)
+
+        if self.is_selling_mode:
+            stage = col("stage")[order]
+            tags = {stage: self.price_tag(stage) for stage in np.unique(stage).tolist()}
+            label_x, label_y = centerx - 10, top - 20
+            tag_sizes = np.zeros((max(tags) + 1, 2), int)
+            for tag_stage, tag in tags.items():
+                tag_sizes[tag_stage] = tag.get_size()
+            tag_sizes = tag_sizes[stage]
+            x0, y0 = np.minimum(x0, label_x), np.minimum(y0, label_y)
+            x1, y1 = np.maximum(x1, label_x + tag_sizes[:, 0]), np.maximum(y1, label_y + tag_sizes[:, 1])
+            label_key = -stage
+            label_items = [(tags[stage], position) for stage, position in
+                           zip(stage.tolist(), zip(label_x.tolist(), label_y.tolist()))]
+        elif self.show_hunger_bar:
+            hunger_ratio = 1 - (np.minimum(col("hunger")[order], 120) / 120)
+            bar_width = (width * hunger_ratio).astype(int)
+            bar_color = np.where(hunger_ratio > 0.5, 0, np.where(hunger_ratio > 0.25, 1, 2))
+            colors = ((0, 255, 0), (255, 255, 0), (255, 0, 0))
+            y0 = np.minimum(y0, top - 7)
+            label_key = bar_width * 3 + bar_color
+            # One tile lookup per distinct bar; a key below 3 is an empty bar
+            tiles = {key: tile_cache.get((key // 3, 3), colors[key % 3]) for key in np.unique(label_key).tolist()}
+            label_items = [(tiles[key], (x, y)) if key >= 3 else None
+                           for key, x, y in zip(label_key.tolist(), left.tolist(), (top - 7).tolist())]
+        else:
+            label_key = np.full(len(ids), -10 ** 6)
+            label_items = [None] * len(ids)
+        selected = np.isin(ids, [fish.id for fish in (self.selected_fish_1, self.selected_fish_2) if fish])
+        keys = np.stack([x0, y0, x1 - x0, y1 - y0, left, top, width, height, poses, label_key, selected], axis=1)
+        return ids, keys, fish_items, label_items
+
+    @staticmethod
+    def population_damage(looks, drawn):
+        """Extents to redraw between two population_looks, old and new"""
+        ids, keys = looks[:2]
+        old_ids, old_keys = drawn[:2]
+        found = np.zeros(len(ids), bool)
+        changed = np.ones(len(ids), bool)
+        if len(old_ids):
+            at = np.minimum(np.searchsorted(old_ids, ids), len(old_ids) - 1)
+            found = old_ids[at] == ids
+            changed = ~found | (keys != old_keys[at]).any(axis=1)
+            moved_from = old_keys[at[changed & found], :4]
+        else:
+            moved_from = old_keys[:0, :4]
+        # Rows whose id is gone were removed since the last frame
+        gone = old_keys[~np.isin(old_ids, ids), :4]
+        extents = np.concatenate([keys[changed, :4], moved_from, gone])
+        return [pygame.Rect(extent) for extent in extents.tolist()]
+
+    def draw_layers(self, surface, looks, clips=None):
+        """Blit the seaweed, fish and fish label layers in order.
+
+        Each layer is built as a list of (surface, dest) pairs and drawn
+        with a single Surface.blits call. With clips (the dirty renderer's
+        rects) the items are grouped by the clip rects they touch, and each
+        group is blitted under its own clip. looks is a fish_look dict, or
+        population_looks() for the numpy backend, whose items come straight
+        from the columns without a FishView per fish.
+        """
+        seaweed_tile = tile_cache.get((Seaweed.width, Seaweed.height), Seaweed.color)
+        groups = [([], [], []) for _ in clips] if clips is not None else [([], [], [])]
+        everywhere = (0,)
+        for seaweed in self.seaweed_list:
+            item = (seaweed_tile, seaweed.rect)
+            for i in seaweed.rect.collidelistall(clips) if clips is not None else everywhere:
+                groups[i][0].append(item)
+
+        if self.population is not None:
+            self.group_population_items(groups, looks, clips)
+        else:
+            self.group_fish_items(groups, looks, clips)
+
+        for i, group in enumerate(groups):
+            if clips is not None:
+                surface.set_clip(clips[i])
+            for layer in group:
+                if layer:
+                    surface.blits(layer, False)
+        if clips is not None:
+            surface.set_clip(None)
+
+    def group_population_items(self, groups, looks, clips):
+        """Sort population_looks items into draw_layers' groups with array tests"""
+        _, keys, fish_items, label_items = looks
+        if clips is None:
+            groups[0][1].extend(fish_items)
+            groups[0][2].extend(item for item in label_items if item is not None)
+            return
+        x0, y0 = keys[:, 0], keys[:, 1]
+        x1, y1 = x0 + keys[:, 2], y0 + keys[:, 3]
+        for clip, group in zip(clips, groups):
+            rows = np.flatnonzero((x0 < clip.right) & (x1 > clip.left) & (y0 < clip.bottom) & (y1 > clip.top))
+            group[1].extend(fish_items[row] for row in rows.tolist())
+            group[2].extend(label_items[row] for row in rows.tolist() if label_items[row] is not None)
+
+    def group_fish_items(self, groups, looks, clips):
+        """Sort fish_look items into draw_layers' groups"""
+        everywhere = (0,)
+        selling = self.is_selling_mode
+        # Id order, not fish_list order: swap-removal would shuffle the stack
+        for fish in self.fish_list.in_order():
+            extent, rect, image, label, selected = looks[fish]
+            if image is not None:
+                width, height = image.get_size()
+                item = (image, (rect.centerx - width // 2, rect.centery - height // 2))
+            else:
+                item = (tile_cache.get(rect.size, fish.species.color), rect)
+            if label is None:
+                label_item = None
+            elif selling:
+                label_item = (label, (rect.centerx - 10, rect.top - 20))
+            else:
+                bar_width, bar_color = label
+                label_item = (tile_cache.get((bar_width, 3), bar_color), (rect.x, rect.y - 7)) if bar_width > 0 else None
+            for i in extent.collidelistall(clips) if clips is not None else everywhere:
+                group = groups[i]
+                group[1].append(item)
+                if label_item is not None:
+                    group[2].append(label_item)
+
+    def refresh_buttons(self):
+        self.settings_button.text = "Settings"
+        self.pause_button.text = "Play" if self.is_paused else "Pause"
+        self.breed_button.active = (self.population_stats.breedable_adults and
+                                   self.selected_fish_1 and self.selected_fish_2 and
+                                   not self.breeding_in_progress and
+                                   self.selected_fish_1.stage == 5 and
+                                   self.selected_fish_2.stage == 5 and
+                                   self.selected_fish_1.gender != self.selected_fish_2.gender)
+
+    def button_look(self):
+        return self.pause_button.text, bool(self.breed_button.active)
+
+    def draw_buttons(self, surface):
+        pygame.draw.rect(surface, (0, 128, 0), self.shop_button.rect)
+        shop_text = text_cache.render(self.font, "Shop", WHITE)
+        surface.blit(shop_text, (self.shop_button.rect.x + 10, self.shop_button.rect.y + 10))
+
+        self.settings_button.draw(surface, self.font)
+        self.pause_button.draw(surface, self.font)
+        self.speed_1x_button.draw(surface, self.font)
+        self.speed_3x_button.draw(surface, self.font)
+        self.speed_6x_button.draw(surface, self.font)
+        self.breed_button.draw(surface, self.font)
+
+    def draw_selection(self, surface):
+        outlines = []
+        for fish, color in ((self.selected_fish_1, (0, 255, 0)), (self.selected_fish_2, (255, 255, 0))):
+            if fish:
+                rect = self.draw_rect(fish)
+                outlines.append((tile_cache.get(rect.size, color, 2), rect))
+        surface.blits(outlines, False)
+
+    def hud_stats(self):
+        total_income_rate = self.income_rate()
+        return [
+            f"Fish: {self.population_stats.total}",
+            f"Seaweed: {len(self.seaweed_list)}",
+            f"Coins: {int(self.coins)}",
+            f"Income: {total_income_rate:.2f}/s",
+            f"Speed: {self.time_scale}x"
+        ]
+
+    def draw_stats(self, surface, stats):
+        for i, stat in enumerate(stats):
+            # Only look a line up again when its value has changed
+            if self.hud_lines[i][0] != stat:
+                self.hud_lines[i] = (stat, text_cache.render(self.font, stat, WHITE))
+            surface.blit(self.hud_lines[i][1], (10, 10 + i * 40))
+
+    def draw_menus(self, surface):
+        if self.shop_open:
+            pygame.draw.rect(surface, (50, 50, 50, 200), (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 4, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+            title_text = text_cache.render(self.font, "Shop - Buy Items", WHITE)
+            surface.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 4 + 20))
+            
+            guppy_btn = pygame.Rect(260, 220, 280, 40)
+            guppy_color = GREEN if self.coins >= self.shop_items["Guppy"] else RED
+            pygame.draw.rect(surface, guppy_color, guppy_btn)
+            guppy_text = text_cache.render(self.font, f"Buy Guppy ({self.shop_items['Guppy']} coins)", WHITE)
+            surface.blit(guppy_text, (guppy_btn.x + 20, guppy_btn.y + 10))
+            
+            seaweed_cost = self.shop_items["Seaweed"]
+            one_btn = pygame.Rect(260, 270, 80, 40)
+            one_color = GREEN if self.coins >= seaweed_cost * 1 else RED
+            pygame.draw.rect(surface, one_color, one_btn)
+            one_text = text_cache.render(self.font, "1", WHITE)
+            surface.blit(one_text, (one_btn.x + 30, one_btn.y + 10))
+            
+            ten_btn = pygame.Rect(350, 270, 80, 40)
+            ten_color = GREEN if self.coins >= seaweed_cost * 10 else RED
+            pygame.draw.rect(surface, ten_color, ten_btn)
+            ten_text = text_cache.render(self.font, "10", WHITE)
+            surface.blit(ten_text, (ten_btn.x + 25, ten_btn.y + 10))
+            
+            hundred_btn = pygame.Rect(440, 270, 100, 40)
+            hundred_color = GREEN if self.coins >= seaweed_cost * 100 else RED
+            pygame.draw.rect(surface, hundred_color, hundred_btn)
+            hundred_text = text_cache.render(self.font, "100", WHITE)
+            surface.blit(hundred_text, (hundred_btn.x + 25, hundred_btn.y + 10))
+            
+            auto_feed_btn = pygame.Rect(260, 320, 280, 40)
+            auto_feed_color = GREEN if self.auto_feed else RED
+            pygame.draw.rect(surface, auto_feed_color, auto_feed_btn)
+            auto_feed_text = text_cache.render(self.font, "Auto Feed", WHITE)
+            surface.blit(auto_feed_text, (auto_feed_btn.x + 20, auto_feed_btn.y + 10))
+            
+            cost_text = text_cache.render(self.font, f"Seaweed: {seaweed_cost} coins each", WHITE)
+            surface.blit(cost_text, (260, 370))
+            
+            sell_mode_btn = pygame.Rect(260, 420, 280, 40)
+            pygame.draw.rect(surface, (255, 165, 0), sell_mode_btn)
+            sell_mode_text = text_cache.render(self.font, "Toggle Sell Mode", WHITE)
+            surface.blit(sell_mode_text, (sell_mode_btn.x + 20, sell_mode_btn.y + 10))
+            
+            close_btn = pygame.Rect(260, 470, 280, 40)
+            pygame.draw.rect(surface, RED, close_btn)
+            close_text = text_cache.render(self.font, "Close Shop", WHITE)
+            surface.blit(close_text, (close_btn.x + 20, close_btn.y + 10))
+
+            self.guppy_btn = guppy_btn
+            self.seaweed_buttons = {
+                1: one_btn,
+                10: ten_btn,
+                100: hundred_btn
+            }
+            self.auto_feed_btn = auto_feed_btn
+            self.sell_mode_btn = sell_mode_btn
+            self.close_btn = close_btn
+        elif self.sell_menu_open:
+            pygame.draw.rect(surface, BLACK, (250, 200, 300, 300))
+            pygame.draw.rect(surface, WHITE, (250, 200, 300, 300), 2)
+            sell_text = text_cache.render(self.font, "Sell Fish", WHITE)
+            surface.blit(sell_text, (400, 210))
+            
+            self.fish_to_sell = []
+            y_offset = 250
+            for fish in self.fish_list:
+                btn_rect = pygame.Rect(260, y_offset, 280, 40)
+                self.fish_to_sell.append(btn_rect)
+                pygame.draw.rect(surface, GREEN, btn_rect)
+                fish_text = text_cache.render(self.font, f"Sell {fish.type} (Stage {fish.stage})", WHITE)
+                surface.blit(fish_text, (btn_rect.x + 20, btn_rect.y + 10))
+                y_offset += 50
+            
+            close_btn = pygame.Rect(260, 470, 280, 40)
+            pygame.draw.rect(surface, RED, close_btn)
+            close_text = text_cache.render(self.font, "Close", WHITE)
+            surface.blit(close_text, (close_btn.x + 20, close_btn.y + 10))
+        
+        elif self.fish_details_open and self.selected_fish:
+            pygame.draw.rect(surface, BLACK, (250, 200, 300, 200))
+            pygame.draw.rect(surface, WHITE, (250, 200, 300, 200), 2)
+            details_text = text_cache.render(self.font, "Fish Details", WHITE)
+            surface.blit(details_text, (400, 210))
+            
+            type_text = text_cache.render(self.font, f"Type: {self.selected_fish.type}", WHITE)
+            surface.blit(type_text, (260, 240))
+            stage_text = text_cache.render(self.font, f"Stage: {self.selected_fish.stage}", WHITE)
+            surface.blit(stage_text, (260, 270))
+            hunger_text = text_cache.render(self.font, f"Hunger: {int(self.selected_fish.hunger)}", WHITE)
+            surface.blit(hunger_text, (260, 300))
+            food_text = text_cache.render(self.font, f"Food Eaten: {self.selected_fish.food_eaten}", WHITE)
+            surface.blit(food_text, (260, 330))
+            
+            close_btn = pygame.Rect(260, 370, 280, 40)
+            pygame.draw.rect(surface, RED, close_btn)
+            close_text = text_cache.render(self.font, "Close", WHITE)
+            surface.blit(close_text, (close_btn.x + 20, close_btn.y + 10))
+        elif self.settings_open:
+            pygame.draw.rect(surface, (50, 50, 50, 200), (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 4, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+            title_text = text_cache.render(self.font, "Settings", WHITE)
+            surface.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 4 + 20))
+            
+            hunger_bar_btn = pygame.Rect(260, 220, 280, 40)
+            hunger_bar_color = GREEN if self.show_hunger_bar else RED
+            pygame.draw.rect(surface, hunger_bar_color, hunger_bar_btn)
+            hunger_bar_text = text_cache.render(self.font, "Show Hunger Bar", WHITE)
+            surface.blit(hunger_bar_text, (hunger_bar_btn.x + 20, hunger_bar_btn.y + 10))
+            
+            close_btn = pygame.Rect(260, 270, 280, 40)
+            pygame.draw.rect(surface, RED, close_btn)
+            close_text = text_cache.render(self.font, "Close Settings", WHITE)
+            surface.blit(close_text, (close_btn.x + 20, close_btn.y + 10))
+
+            self.hunger_bar_btn = hunger_bar_btn
+            self.close_settings_btn = close_btn
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            # Profiling runs while the overlay is up, or while a trace records
+            self.profiler.show_overlay = not self.profiler.show_overlay
+            self.profiler.enabled = self.profiler.show_overlay or self.profiler.trace_events is not None
+            return True
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pos = event.pos
+            # Anything that changes the game goes through perform(), so a
+            # recorder sees it and a replay can repeat it without the menus
+            if self.shop_open:
+                if self.seaweed_buttons:
+                    for quantity, btn in self.seaweed_buttons.items():
+                        if btn.collidepoint(mouse_pos):
+                            try:
+                                quantity = int(quantity)
+                                if quantity > 0:
+                                    self.perform("buy_seaweed", quantity)
+                                    self.perform("set_option", "shop_open", False)
+                                    return True
+                            except ValueError:
+                                log_economy.warning("Invalid quantity: %s", quantity)
+                if self.guppy_btn and self.guppy_btn.collidepoint(mouse_pos):
+                    self.selected_item = "Guppy"
+                    self.perform("buy_fish", "Guppy")
+                    return True
+                if self.auto_feed_btn and self.auto_feed_btn.collidepoint(mouse_pos):
+                    self.perform("set_option", "auto_feed", not self.auto_feed)
+                    return True
+                elif self.sell_mode_btn and self.sell_mode_btn.collidepoint(mouse_pos):
+                    self.perform("set_option", "is_selling_mode", not self.is_selling_mode)
+                    self.perform("set_option", "shop_open", False)
+                    return True
+                elif self.close_btn and self.close_btn.collidepoint(mouse_pos):
+                    self.perform("set_option", "shop_open", False)
+                    return True
+            elif self.sell_menu_open:
+                for i, btn_rect in enumerate(self.fish_to_sell):
+                    if btn_rect.collidepoint(mouse_pos):
+                        if i < len(self.fish_list):
+                            self.perform("sell_fish", self.fish_list[i])
+                            self.perform("set_option", "sell_menu_open", False)
+                            return True
+                close_btn = pygame.Rect(260, 470, 280, 40)
+                if close_btn.collidepoint(mouse_pos):
+                    self.perform("set_option", "sell_menu_open", False)
+                    return True
+            elif self.fish_details_open:
+                close_btn = pygame.Rect(260, 370, 280, 40)
+                if close_btn.collidepoint(mouse_pos):
+                    self.perform("set_option", "fish_details_open", False)
+                    self.perform("set_option", "selected_fish", None)
+                    return True
+            elif self.settings_open:
+                if self.hunger_bar_btn and self.hunger_bar_btn.collidepoint(mouse_pos):
+                    self.perform("set_option", "show_hunger_bar", not self.show_hunger_bar)
+                    return True
+                elif self.close_settings_btn and self.close_settings_btn.collidepoint(mouse_pos):
+                    self.perform("set_option", "settings_open", False)
+                    return True
+            else:
+                if self.shop_button.rect.collidepoint(mouse_pos):
+                    self.perform("set_option", "shop_open", True)
+                    return True
+                elif self.settings_button.rect.collidepoint(mouse_pos):
+                    self.perform("set_option", "settings_open", True)
+                    return True
+                elif self.pause_button.rect.collidepoint(mouse_pos):
+                    self.perform("set_option", "is_paused", not self.is_paused)
+                    return True
+                elif self.speed_1x_button.rect.collidepoint(mouse_pos):
+                    self.perform("set_option", "time_scale", 1.0)
+                    return True
+                elif self.speed_3x_button.rect.collidepoint(mouse_pos):
+                    self.perform("set_option", "time_scale", 3.0)
+                    return True
+                elif self.speed_6x_button.rect.collidepoint(mouse_pos):
+                    self.perform("set_option", "time_scale", 6.0)
+                    return True
+                elif self.is_selling_mode:
+                    fish = self.fish_at(mouse_pos)
+                    if fish:
+                        self.perform("sell_fish", fish)
+                        return True
+                elif self.breed_button.rect.collidepoint(mouse_pos) and self.breed_button.active:
+                    if self.selected_fish_1 and self.selected_fish_2:
+                        self.perform("start_breeding", self.selected_fish_1, self.selected_fish_2)
+                    return True
+                else:
+                    fish = self.fish_at(mouse_pos)
+                    if fish:
+                        self.perform("click_fish", fish)
+                        return True
+        return True
+
+    def perform(self, action, *args):
+        """Run a player action, handing it to the session recorder first"""
+        if self.recorder is not None:
+            self.recorder.record(self.sim_clock.now, action, args)
+        getattr(self, action)(*args)
+
+    def set_option(self, name, value):
+        setattr(self, name, value)
+
+    def click_fish(self, fish):
+        """Select adults for breeding; any other fish opens its details"""
+        if fish.stage == 5:
+            if not self.selected_fish_1:
+                self.selected_fish_1 = fish
+                log_breeding.debug("Selected Fish ID %d (%s)", fish.id, fish.gender)
+            elif not self.selected_fish_2 and fish != self.selected_fish_1:
+                self.selected_fish_2 = fish
+                log_breeding.debug("Selected Fish ID %d (%s)", fish.id, fish.gender)
+                if self.selected_fish_1.gender == self.selected_fish_2.gender:
+                    log_breeding.debug("Same gender: Fish ID %d and ID %d", self.selected_fish_1.id, self.selected_fish_2.id)
+                    self.selected_fish_1.scatter()
+                    self.selected_fish_2.scatter()
+                    self.selected_fish_1 = None
+                    self.selected_fish_2 = None
+            elif fish == self.selected_fish_1:
+                self.selected_fish_1 = None
+                log_breeding.debug("Unselected Fish ID %d", fish.id)
+            elif fish == self.selected_fish_2:
+                self.selected_fish_2 = None
+                log_breeding.debug("Unselected Fish ID %d", fish.id)
+        else:
+            self.selected_fish = fish
+            self.fish_details_open = True
+
+    def reseed(self, seed):
+        """Restart the game's random streams, e.g. where a recording begins"""
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if self.population is not None:
+            self.population.rng = np.random.default_rng(seed)
+
+    def start_breeding(self, fish_1, fish_2):
+        """Pair two adults and start their courtship clock"""
+        self.breeding_in_progress = True
+        fish_1.breeding_partner = fish_2
+        fish_2.breeding_partner = fish_1
+        fish_1.collision_start_time = fish_2.collision_start_time = self.sim_clock.now
+        self.timers.schedule_mate(fish_1)
+        log_breeding.info("Breeding initiated: Fish ID %d with Fish ID %d", fish_1.id, fish_2.id)
+
+    def buy_seaweed(self, quantity, reserved=False):
+        total_cost = quantity * self.shop_items["Seaweed"]
+        if self.coins >= total_cost:
+            self.coins -= total_cost
+            for _ in range(quantity):
+                x, y = self.seaweed_areas[self.current_area]
+                self.add_seaweed(self.seaweed_list.make(Seaweed, x, y, reserved))
+                self.current_area = (self.current_area + 1) % len(self.seaweed_areas)
+            log_economy.info("Bought %d seaweed for %d coins", quantity, total_cost)
+        else:
+            if debug_log.economy:
+                log_economy.debug("Not enough coins for %d seaweed. Need %d, have %.1f", quantity, total_cost, self.coins)
+
+    def add_seaweed(self, seaweed):
+        self.seaweed_list.add(seaweed)
+        self.seaweed_index.add(seaweed)
+        self.damaged_rects.append(seaweed.rect.copy())
+
+    def remove_seaweed(self, seaweed):
+        self.seaweed_list.remove(seaweed)
+        self.seaweed_index.remove(seaweed)
+        self.damaged_rects.append(seaweed.rect.copy())
+
+    def create_fish(self, x, y, fish_type="Guppy", stage=1):
+        if self.population is not None:
+            return self.population.spawn(x, y, fish_type, stage)
+        return self.fish_list.make(Fish, self, x, y, fish_type, stage)
+
+    def add_fish(self, fish):
+        self.fish_list.add(fish)
+        self.previous_centers.pop(fish, None)  # A pooled fish must not tween from its last life
+        self.fish_grid.invalidate()
+        self.population_stats.add(fish)
+        if self.population is None:
+            self.timers.add(fish)
+
+    def remove_fish(self, fish):
+        self.seaweed_index.retarget(fish, None)
+        self.timers.discard(fish)
+        self.fish_list.remove(fish)
+        self.fish_grid.invalidate()
+        self.population_stats.remove(fish)
+        if self.population is not None:
+            self.population.remove(fish)
+        # Let go of the fish everywhere else, because the pool may hand its
+        # object to a new fish after this tick
+        partner = fish.breeding_partner
+        if partner is not None and partner.breeding_partner is fish:
+            partner.breeding_partner = None
+            partner.collision_start_time = 0
+            self.breeding_in_progress = False
+        for name in ("selected_fish", "selected_fish_1", "selected_fish_2"):
+            if getattr(self, name) is fish:
+                setattr(self, name, None)
+
+    def buy_fish(self, type_):
+        cost = self.shop_items.get(type_, 12)
+        if self.coins >= cost:
+            self.coins -= cost
+            self.add_fish(self.create_fish(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, type_))
+
+    def sell_fish(self, fish):
+        base_price = 3
+        sell_price = base_price * (1.0 + (fish.stage - 1) * 0.4)
+        self.coins += sell_price
+        self.remove_fish(fish)
+        log_economy.info("Sold Fish ID %d for %.1f coins! Stage: %d", fish.id, sell_price, fish.stage)
+        if not hasattr(self, 'fish_sold'):
+            self.fish_sold = 0
+        self.fish_sold += 1
+        if self.fish_sold == 1:
+            log_economy.info("Achievement Unlocked: First Sale")
+        elif self.fish_sold == 10:
+            log_economy.info("Achievement Unlocked: Fishmonger")
+        elif self.fish_sold == 50:
+            log_economy.info("Achievement Unlocked: Aquarium Tycoon")
+        self.fish_details_open = False
+        self.selected_fish = None
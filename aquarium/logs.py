@@ -0,0 +1,70 @@
+"""Per-category game logging, optionally written from a background thread."""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+
+# Logging
+LOG_CATEGORIES = ("movement", "hunger", "breeding", "economy")
+log = logging.getLogger("aquarium")
+log_movement = logging.getLogger("aquarium.movement")
+log_hunger = logging.getLogger("aquarium.hunger")
+log_breeding = logging.getLogger("aquarium.breeding")
+log_economy = logging.getLogger("aquarium.economy")
+
+
+class LogSwitches:
+    """Per-category debug flags, checked before hot-path log calls.
+
+    Refreshed by configure_logging so a disabled debug event costs a single
+    attribute lookup and never builds its message.
+    """
+
+    movement = False
+    hunger = False
+    breeding = False
+    economy = False
+
+
+debug_log = LogSwitches()
+_log_listener = None
+
+
+def configure_logging(level=logging.INFO, categories=LOG_CATEGORIES, background=True, stream=None):
+    """Route game logs to stream (stdout by default) at level.
+
+    Only the listed categories emit; the others are switched off entirely.
+    With background=True records are queued and written by a listener
+    thread, so a slow pipe or journald sink never stalls the frame.
+    """
+    global _log_listener
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    stop_logging()
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+    if background:
+        log_queue = queue.SimpleQueue()
+        _log_listener = logging.handlers.QueueListener(log_queue, handler)
+        _log_listener.start()
+        handler = logging.handlers.QueueHandler(log_queue)
+
+    log.handlers[:] = [handler]
+    log.setLevel(level)
+    log.propagate = False
+    for name in LOG_CATEGORIES:
+        category_log = logging.getLogger(f"aquarium.{name}")
+        category_log.setLevel(logging.NOTSET if name in categories else logging.CRITICAL + 1)
+        setattr(debug_log, name, category_log.isEnabledFor(logging.DEBUG))
+
+
+@atexit.register
+def stop_logging():
+    """Flush and stop the background log writer, if one is running"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
@@ -0,0 +1,110 @@
+"""Fixed-step simulation ticks for a variable-rate renderer."""
+import threading
+import time
+
+from .config import FIXED_DT, TICK_BUDGET
+from .logs import log
+
+
+# Frame pacing
+class FixedStepLoop:
+    """Fixed-size simulation ticks under a variable-rate renderer.
+
+    Frame time is accumulated and spent in ticks of FIXED_DT simulated
+    seconds, so the step fish move by never depends on the frame rate:
+    6x speed runs six ticks a frame instead of one six-times-longer tick
+    that lets fish swim past seaweed, and 100x runs a hundred. A frame
+    runs as many ticks as it owes until they have taken budget wall
+    seconds; only then is the leftover time dropped, so the tank slows
+    down rather than spiralling. The
+    renderer draws fish alpha() of the way from the previous tick to the
+    latest one.
+    """
+
+    def __init__(self, game, recorder=None, tick=FIXED_DT, budget=TICK_BUDGET):
+        self.game = game
+        self.recorder = recorder
+        self.tick = tick
+        self.budget = budget
+        self.accumulator = 0.0
+        self.advanced_at = time.perf_counter()
+        self.ticks = 0
+        self.dropped = 0.0
+        # Held for each tick, and by whoever reads or changes the game between ticks
+        self.lock = threading.RLock()
+
+    def tick_wall_time(self):
+        """Wall seconds one tick covers at the current time_scale"""
+        return self.tick / max(self.game.time_scale, 0.001)
+
+    def advance(self, frame_dt):
+        """Spend frame_dt wall seconds on ticks; returns how many ran"""
+        ran = 0
+        with self.lock:
+            self.accumulator += frame_dt
+            step = self.tick_wall_time()
+            start = now = time.perf_counter()
+            tick_cost = 0.0
+            while self.accumulator >= step:
+                if now - start >= self.budget:
+                    self.dropped += self.accumulator
+                    log.debug("Simulation fell behind: dropped %.3fs", self.accumulator)
+                    self.accumulator = 0.0
+                    break
+                # Only the last tick of the frame needs a starting point to
+                # interpolate from: the last one owed, or the last the budget allows
+                last = self.accumulator - step < step or now - start + tick_cost >= self.budget
+                self.run_tick(step, last)
+                self.accumulator -= step
+                ran += 1
+                step = self.tick_wall_time()
+                tick_cost, now = time.perf_counter() - now, time.perf_counter()
+            self.advanced_at = time.perf_counter()
+        return ran
+
+    def run_tick(self, dt, interpolate=True):
+        game = self.game
+        if interpolate:
+            game.remember_centers()
+        if self.recorder:
+            self.recorder.frame(dt)
+        game.update(dt)
+        self.ticks += 1
+
+    def alpha(self):
+        """How far the renderer is from the latest tick toward the next, 0-1"""
+        elapsed = self.accumulator + time.perf_counter() - self.advanced_at
+        return min(1.0, elapsed / self.tick_wall_time())
+
+
+class SimulationThread:
+    """Runs a FixedStepLoop's ticks on a worker thread.
+
+    The main thread keeps handling events and rendering at its own rate.
+    It holds the loop's lock while it does, so every frame shows the last
+    completed tick and never a tank halfway through one.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        loop = self.loop
+        last = time.perf_counter()
+        while not self.stopping.is_set():
+            now = time.perf_counter()
+            try:
+                loop.advance(now - last)
+            except Exception:
+                log.exception("Simulation thread stopped")
+                return
+            last = now
+            # Sleep until the next tick is due
+            self.stopping.wait(max(0.0, loop.tick_wall_time() - loop.accumulator))
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
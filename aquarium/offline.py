@@ -0,0 +1,185 @@
+"""Event-driven catch-up for the time a saved tank was closed."""
+import heapq
+
+from .logs import log_hunger
+from .sim import hunger_rate
+
+
+# Offline progress
+class OfflineProgress:
+    """Fast-forward a resumed tank through the time it was closed.
+
+    Hunger is a line per fish, and the engine jumps between the moments
+    something happens: a fish turns hungry, needs auto feed or starves, a
+    birth is due or a courtship completes. Income accrues exactly between
+    events. Eating is approximate, since fish don't swim offline: hungry
+    fish eat at once and well-fed fish graze at GRAZE_RATE. Against stepped
+    play, coins land within about 3% on both backends, fish and starved
+    counts match, and births match only in distribution.
+    """
+
+    HUNGRY = 30  # Fish start looking for seaweed
+    AUTO_FEED = 60  # Waiting fish try auto feed again at this hunger
+    STARVING = 150  # Fish die at this hunger if there is no seaweed
+    # Chance meals per fish-second per seaweed for fish swimming past it,
+    # measured from stepped play with well-fed fish
+    GRAZE_RATE = 0.015
+
+    def __init__(self, game):
+        self.game = game
+        self.events = []
+        self.seq = 0
+        self.version = {}
+        self.hunger_line = {}  # fish -> (hunger, since)
+        self.breed_due = {}  # fish -> sim time its breed timer runs out
+        self.waiting = []  # Hungry fish with no seaweed, in the order they got hungry
+        self.grazable = 0  # Seaweed any fish may eat, not reserved auto feed stock
+        self.now = game.sim_clock.now
+
+    def run(self, seconds):
+        """Advance the game by seconds of simulated time; returns event count"""
+        game = self.game
+        end = self.now + seconds
+        for fish in game.fish_list:
+            game.seaweed_index.retarget(fish, None)
+            self.hunger_line[fish] = (fish.hunger, self.now)
+            if fish.breed_timer > 0:
+                self.breed_due[fish] = self.now + fish.breed_timer
+            elif fish.is_fertilized:
+                self.breed_due[fish] = self.now
+        self.waiting = [fish for fish in game.fish_list if fish.hunger >= self.HUNGRY]
+        self.grazable = sum(not seaweed.reserved for seaweed in game.seaweed_list)
+        for fish in game.fish_list:
+            self.schedule(fish)
+        self.feed_waiting()
+        pair = [fish for fish in game.fish_list if fish.breeding_partner]
+        if game.breeding_in_progress and pair:
+            self.push(pair[0].collision_start_time + pair[0].required_collision_time, "mate", pair[0], None)
+
+        handled = 0
+        while self.events and self.events[0][0] <= end:
+            when, _, kind, fish, version = heapq.heappop(self.events)
+            if version is not None and version != self.version.get(fish):
+                continue
+            self.advance(max(when, self.now))
+            getattr(self, "on_" + kind)(fish)
+            handled += 1
+        self.advance(end)
+
+        for fish in game.fish_list:
+            fish.hunger = self.hunger(fish)
+            fish.is_hungry = fish.hunger > self.HUNGRY
+            fish.breed_timer = max(0.0, self.breed_due.get(fish, end) - end)
+        return handled
+
+    def advance(self, when):
+        game = self.game
+        game.coins += game.income_rate() * (when - self.now)
+        self.now = when
+        game.sim_clock.now = when
+
+    def hunger(self, fish):
+        hunger, since = self.hunger_line[fish]
+        return hunger + hunger_rate(fish.stage) * (self.now - since)
+
+    def push(self, when, kind, fish, version):
+        heapq.heappush(self.events, (when, self.seq, kind, fish, version))
+        self.seq += 1
+
+    def schedule(self, fish):
+        """Queue the next hunger threshold and birth for fish, dropping older ones"""
+        version = self.version[fish] = self.version.get(fish, 0) + 1
+        hunger = self.hunger(fish)
+        rate = hunger_rate(fish.stage)
+        # Waiting list membership, not the recomputed hunger, decides which
+        # threshold is next, so float error at a crossing can't requeue it
+        if fish not in self.waiting:
+            self.push(self.now + max(0.0, self.HUNGRY - hunger) / rate, "hungry", fish, version)
+            if self.grazable:
+                interval = fish.eat_cooldown + 1 / (self.GRAZE_RATE * self.grazable)
+                self.push(max(self.now, fish.last_eat_time) + interval, "graze", fish, version)
+        else:
+            if hunger < self.AUTO_FEED:
+                self.push(self.now + (self.AUTO_FEED - hunger) / rate, "auto_feed", fish, version)
+            self.push(self.now + max(0.0, self.STARVING - hunger) / rate, "starve", fish, version)
+        if fish.is_fertilized and fish.gender == "female" and fish.stage == fish.max_stage:
+            self.push(self.breed_due.get(fish, self.now), "birth", fish, version)
+
+    def feed_waiting(self):
+        """Give hungry fish seaweed, buying it the way auto feed would"""
+        game = self.game
+        # The auto feed planner stocks seaweed before fish turn hungry, so
+        # live play feeds the whole waiting list as soon as it forms
+        frenzy = game.auto_feed
+        while self.waiting:
+            if not game.seaweed_list:
+                if not frenzy:
+                    return
+                game.buy_seaweed(1, reserved=True)
+                if not game.seaweed_list:
+                    return
+            fish = self.waiting[0]
+            if fish.last_eat_time + fish.eat_cooldown > self.now:
+                # Still digesting; try again when the cooldown is over
+                self.push(fish.last_eat_time + fish.eat_cooldown, "hungry", fish, self.version[fish])
+                return
+            self.waiting.pop(0)
+            self.eat(fish)
+
+    def eat(self, fish, seaweed=None):
+        game = self.game
+        if seaweed is None:
+            seaweed = game.seaweed_index.nearest(fish.rect.centerx, fish.rect.centery)
+        if not seaweed.reserved:
+            self.grazable -= 1
+        fish.eat_seaweed(seaweed)
+        game.remove_seaweed(seaweed)
+        self.hunger_line[fish] = (0.0, self.now)
+        self.schedule(fish)
+
+    def on_hungry(self, fish):
+        if fish not in self.waiting:
+            self.waiting.append(fish)
+            self.schedule(fish)
+        self.feed_waiting()
+
+    def on_graze(self, fish):
+        if fish.last_eat_time + fish.eat_cooldown > self.now or not self.grazable:
+            self.schedule(fish)
+            return
+        self.eat(fish, next(seaweed for seaweed in self.game.seaweed_list if not seaweed.reserved))
+
+    def on_auto_feed(self, fish):
+        self.feed_waiting()
+
+    def on_starve(self, fish):
+        game = self.game
+        if game.seaweed_list:
+            return
+        log_hunger.info("Fish ID %d should die: Hunger %.1f", fish.id, self.hunger(fish))
+        if fish in self.waiting:
+            self.waiting.remove(fish)
+        del self.version[fish]
+        game.remove_fish(fish)
+        game.coins = max(0, game.coins - 5)
+        game.starved += 1
+
+    def on_birth(self, fish):
+        game = self.game
+        fish.breed_timer = 0
+        for baby in fish.spawn_babies():
+            game.add_fish(baby)
+            self.hunger_line[baby] = (0.0, self.now)
+            self.schedule(baby)
+        self.breed_due[fish] = self.now + fish.breed_delay
+        self.schedule(fish)
+
+    def on_mate(self, fish):
+        partner = fish.breeding_partner
+        if partner is None or fish not in self.version or partner not in self.version:
+            return
+        fish.finish_breeding()
+        for mate in (fish, partner):
+            if mate.is_fertilized:
+                self.breed_due[mate] = self.now + mate.breed_delay
+            self.schedule(mate)
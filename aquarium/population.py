@@ -0,0 +1,509 @@
+"""Struct-of-arrays fish population for the numpy backend."""
+import math
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # Only the numpy fish backend needs it
+    np = None
+
+from .config import FISH_SPEED, MAX_FISH_ANGLE, SCREEN_HEIGHT, SCREEN_WIDTH
+from .logs import debug_log, log_breeding, log_hunger
+from .assets import frame_cache, stage_size_multiplier
+from .sim import Fish, SPECIES, hunger_rate
+
+
+# Vectorized fish population
+class FishColumn:
+    """Descriptor mapping a FishView attribute onto its population column"""
+
+    def __init__(self, cast=float):
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, fish, owner=None):
+        if fish is None:
+            return self
+        return self.cast(fish.pop.cols[self.name][fish.slot])
+
+    def __set__(self, fish, value):
+        fish.pop.cols[self.name][fish.slot] = value
+
+
+class DetachedRow:
+    """Frozen copy of one population row, kept by views of removed fish"""
+
+    def __init__(self, pop, slot):
+        self.cols = {name: column[slot:slot + 1].copy() for name, column in pop.cols.items()}
+        self.sprite_frames = pop.sprite_frames
+
+
+class FishView(Fish):
+    """A Fish whose per-fish state lives in a FishPopulation row.
+
+    Column attributes read and write the population's NumPy arrays, so the
+    inherited Fish methods (eating, breeding, spawning) keep working while
+    movement, hunger and animation advance in batches.
+    """
+
+    id = FishColumn(int)
+    stage = FishColumn(int)
+    hunger = FishColumn()
+    food_eaten = FishColumn(int)
+    collision_start_time = FishColumn()
+    breed_timer = FishColumn()
+    is_fertilized = FishColumn(bool)
+    last_breed_time = FishColumn()
+    last_eat_time = FishColumn()
+    speed_x = FishColumn()
+    speed_y = FishColumn()
+    animation_frame = FishColumn(int)
+    animation_timer = FishColumn()
+    current_row = FishColumn(int)
+    current_angle = FishColumn()
+    is_hungry = FishColumn(bool)
+    pause_timer = FishColumn()
+    swim_duration = FishColumn()
+    pause_duration = FishColumn()
+    current_speed = FishColumn()
+    movement_timer = FishColumn()
+    speed_variation = FishColumn()
+
+    __slots__ = ("pop", "slot", "_partner", "_target")
+
+    def __init__(self, pop, slot, game, fish_type):
+        self.pop = pop
+        self.slot = slot
+        self.id = Fish._id_counter
+        Fish._id_counter += 1
+        self.game = game
+        self.type = fish_type
+        self.species = SPECIES[fish_type]
+        self._partner = None
+        self._target = None
+
+    @property
+    def gender(self):
+        return "female" if self.pop.cols["is_female"][self.slot] else "male"
+
+    @property
+    def breeding_partner(self):
+        return self._partner
+
+    @breeding_partner.setter
+    def breeding_partner(self, partner):
+        self._partner = partner
+        self.pop.cols["has_partner"][self.slot] = partner is not None
+
+    @property
+    def target_seaweed(self):
+        return self._target
+
+    @target_seaweed.setter
+    def target_seaweed(self, seaweed):
+        self._target = seaweed
+        cols = self.pop.cols
+        cols["has_target"][self.slot] = seaweed is not None
+        if seaweed is not None:
+            cols["target_x"][self.slot] = seaweed.rect.centerx
+            cols["target_y"][self.slot] = seaweed.rect.centery
+
+    @property
+    def rect(self):
+        cols = self.pop.cols
+        i = self.slot
+        return pygame.Rect(int(cols["left"][i]), int(cols["top"][i]),
+                           int(cols["width"][i]), int(cols["height"][i]))
+
+    @rect.setter
+    def rect(self, rect):
+        cols = self.pop.cols
+        i = self.slot
+        cols["left"][i], cols["top"][i] = rect.x, rect.y
+        cols["width"][i], cols["height"][i] = rect.width, rect.height
+
+    @property
+    def previous_center(self):
+        """Center before the latest tick, or None for a fish born during it"""
+        cols = self.pop.cols
+        i = self.slot
+        if not cols["tween"][i]:
+            return None
+        return int(cols["previous_x"][i]), int(cols["previous_y"][i])
+
+    @property
+    def animation_frames(self):
+        return self.pop.sprite_frames[int(self.pop.cols["sprite"][self.slot])]
+
+    @property
+    def base_image(self):
+        cols = self.pop.cols
+        i = self.slot
+        return self.animation_frames[int(cols["base_row"][i])][int(cols["base_col"][i])]
+
+    @property
+    def image(self):
+        flipped = self.speed_x < 0
+        angle = self.current_angle
+        return frame_cache.pose(self.base_image, flipped, -angle if flipped else angle)
+
+    def grow(self):
+        """Increase the fish's stage if it has eaten enough food"""
+        if self.stage < self.max_stage and self.food_eaten >= self.food_needed[self.stage - 1]:
+            self.stage += 1
+            self.game.population_stats.grew(self, self.stage - 1)
+            self.food_eaten = 0
+            self.pop.set_sprite(self.slot, self.sprite_folder(growing=True), self.rect.center)
+            log_hunger.info("Fish ID %d grew to stage %d", self.id, self.stage)
+
+
+class FishPopulation:
+    """Struct-of-arrays fish storage advanced with batched NumPy operations.
+
+    Movement, boundary bounces, animation timers, hunger, breed timers and
+    rotation run for every fish at once in step(), and seaweed targets are
+    chosen in array passes by choose_targets(); eating and breeding stay
+    per fish but only visit the rows that need them. Rows are
+    swap-removed, so FishView.slot changes when another fish leaves.
+
+    Measured scale: 2,000 fish tick in about 2 ms and draw in about 20 ms;
+    10,000 tick in about 9 ms but take over 100 ms to draw, nearly all of
+    it inside Surface.blits, so a window shows them at under 10 fps.
+    """
+
+    COLUMNS = {
+        "left": "f8", "top": "f8", "width": "f8", "height": "f8",
+        "speed_x": "f8", "speed_y": "f8", "hunger": "f8", "breed_timer": "f8",
+        "last_breed_time": "f8", "last_eat_time": "f8", "collision_start_time": "f8",
+        "pause_timer": "f8", "swim_duration": "f8", "pause_duration": "f8",
+        "current_speed": "f8", "movement_timer": "f8", "speed_variation": "f8",
+        "animation_timer": "f8", "current_angle": "f8", "target_x": "f8", "target_y": "f8",
+        "previous_x": "f8", "previous_y": "f8", "id": "i8", "stage": "i8", "food_eaten": "i8", "animation_frame": "i8", "current_row": "i8",
+        "base_row": "i8", "base_col": "i8", "sprite": "i8",
+        "is_female": "?", "is_fertilized": "?", "is_hungry": "?",
+        "has_target": "?", "has_partner": "?", "tween": "?",
+    }
+    TARGET_BATCH = 16  # Fish choosing seaweed per array pass; see choose_targets
+
+    def __init__(self, game, capacity=256):
+        if np is None:
+            raise RuntimeError("The numpy fish backend requires numpy to be installed")
+        self.game = game
+        self.size = 0
+        self.views = []
+        self.cols = {name: np.zeros(capacity, dtype) for name, dtype in self.COLUMNS.items()}
+        self.sprite_ids = {}
+        self.sprite_frames = []
+        self.pose_sizes = np.zeros((0, 3, 3, 2, frame_cache.angle_slots, 2))
+        self.pose_images = []  # pose_sizes' Surfaces, flattened in the same order
+        self.poses_converted = frame_cache.converted
+        self.angle_step = frame_cache.angle_step
+        self.rng = np.random.default_rng(game.seed)
+
+    def column(self, name):
+        return self.cols[name][:self.size]
+
+    def sprite_id(self, folder_name, size_multiplier):
+        """Register a shared frame grid and the sizes of all its poses"""
+        if self.angle_step != frame_cache.angle_step:
+            self.sprite_ids = {}
+            self.sprite_frames = []
+            self.pose_sizes = np.zeros((0, 3, 3, 2, frame_cache.angle_slots, 2))
+            self.pose_images = []
+            self.angle_step = frame_cache.angle_step
+        key = (folder_name, size_multiplier)
+        sprite = self.sprite_ids.get(key)
+        if sprite is None:
+            frames = frame_cache.get(folder_name, size_multiplier)
+            slots = frame_cache.angle_slots
+            half = slots // 2
+            sizes = np.zeros((1, 3, 3, 2, slots, 2))
+            for row in range(3):
+                for col in range(3):
+                    for flipped in (0, 1):
+                        for slot in range(slots):
+                            image = frame_cache.pose(frames[row][col], bool(flipped), (slot - half) * frame_cache.angle_step)
+                            sizes[0, row, col, flipped, slot] = image.get_size()
+                            self.pose_images.append(image)
+            sprite = len(self.sprite_frames)
+            self.sprite_ids[key] = sprite
+            self.sprite_frames.append(frames)
+            self.pose_sizes = np.concatenate([self.pose_sizes, sizes])
+        return sprite
+
+    def set_sprite(self, slot, folder_name, center):
+        """Switch a row to a new frame grid showing its unrotated base frame"""
+        cols = self.cols
+        sprite = self.sprite_id(folder_name, stage_size_multiplier(int(cols["stage"][slot])))
+        width, height = self.sprite_frames[sprite][1][0].get_size()
+        centerx = math.floor(center[0] + 0.5)
+        centery = math.floor(center[1] + 0.5)
+        cols["sprite"][slot] = sprite
+        cols["base_row"][slot] = 1
+        cols["base_col"][slot] = 0
+        cols["width"][slot] = width
+        cols["height"][slot] = height
+        cols["left"][slot] = centerx - width // 2
+        cols["top"][slot] = centery - height // 2
+
+    def spawn(self, x, y, fish_type="Guppy", stage=1):
+        """Add a fish row initialised like Fish.__init__ and return its view"""
+        if self.size == len(self.cols["left"]):
+            for name, column in self.cols.items():
+                grown = np.zeros(len(column) * 2, column.dtype)
+                grown[:self.size] = column
+                self.cols[name] = grown
+        slot = self.size
+        self.size += 1
+        cols = self.cols
+        for column in cols.values():
+            column[slot] = 0
+        fish = FishView(self, slot, self.game, fish_type)
+        self.views.append(fish)
+        now = self.game.sim_clock.now
+        rng = self.game.rng
+        cols["stage"][slot] = stage
+        cols["is_female"][slot] = rng.choice(["male", "female"]) == "female"
+        cols["last_breed_time"][slot] = now
+        cols["speed_x"][slot] = rng.uniform(-FISH_SPEED, FISH_SPEED) or FISH_SPEED
+        cols["speed_y"][slot] = rng.uniform(-FISH_SPEED * 0.3, FISH_SPEED * 0.3)
+        cols["last_eat_time"][slot] = now
+        cols["current_row"][slot] = 2
+        cols["swim_duration"][slot] = rng.uniform(2.0, 5.0)
+        cols["pause_duration"][slot] = rng.uniform(1.0, 3.0)
+        cols["current_speed"][slot] = 0.5
+        cols["speed_variation"][slot] = 1.0
+        self.set_sprite(slot, fish.sprite_folder(), (x, y))
+        if debug_log.breeding:
+            log_breeding.debug("Created fish ID %d, Type: %s, Stage: %d, Gender: %s", fish.id, fish.type, stage, fish.gender)
+        return fish
+
+    def remove(self, fish):
+        """Swap-remove a fish's row, leaving the view with a frozen copy"""
+        slot = fish.slot
+        last = self.size - 1
+        fish.pop = DetachedRow(self, slot)
+        fish.slot = 0
+        if slot != last:
+            for column in self.cols.values():
+                column[slot] = column[last]
+            moved = self.views[last]
+            moved.slot = slot
+            self.views[slot] = moved
+        self.views.pop()
+        self.size = last
+
+    def breeding_mask(self):
+        # A partner is set exactly while a courtship runs; its start time
+        # can be 0.0 when it begins on the first tick
+        return self.column("has_partner")
+
+    def poses(self):
+        """Index into pose_images of the image FishView.image shows, per row"""
+        col = self.column
+        flipped = col("speed_x") < 0
+        angle = col("current_angle")
+        slots = self.pose_sizes.shape[4]
+        half = slots // 2
+        slot = np.clip(np.round(np.where(flipped, -angle, angle) / self.angle_step).astype(int) + half, 0, slots - 1)
+        return (((col("sprite") * 3 + col("base_row")) * 3 + col("base_col")) * 2 + flipped) * slots + slot
+
+    def current_pose_images(self):
+        """pose_images, fetched again once frame_cache has converted its poses for the display"""
+        if self.poses_converted != frame_cache.check_display():
+            slots = self.pose_sizes.shape[4]
+            half = slots // 2
+            self.pose_images = [frame_cache.pose(frames[row][col], bool(flipped), (slot - half) * self.angle_step)
+                                for frames in self.sprite_frames for row in range(3) for col in range(3)
+                                for flipped in (0, 1) for slot in range(slots)]
+            self.poses_converted = frame_cache.converted
+        return self.pose_images
+
+    def remember_centers(self):
+        """Keep the current centers as every row's previous_center"""
+        centerx, centery = self.centers()
+        self.column("previous_x")[:] = centerx
+        self.column("previous_y")[:] = centery
+        self.column("tween")[:] = True
+
+    def centers(self):
+        left, top = self.column("left"), self.column("top")
+        return left + self.column("width") // 2, top + self.column("height") // 2
+
+    def cells(self, cell_size):
+        """(column, row) of every fish center in a grid of cell_size, as a 2 x size array"""
+        centerx, centery = self.centers()
+        return np.stack([centerx // cell_size, centery // cell_size])
+
+    def choose_targets(self, rows, index, seaweed):
+        """Point rows at the seaweed minimising distance * 0.7 + claims * 30.
+
+        seaweed must be in id order, so ties go to the lower id. Rows pick
+        TARGET_BATCH at a time from one array pass: a batch sees the
+        claims made by earlier batches, but not those made within it.
+        """
+        if not len(rows) or not seaweed:
+            return
+        sx = np.array([item.rect.centerx for item in seaweed], float)
+        sy = np.array([item.rect.centery for item in seaweed], float)
+        claims = np.array([len(index.claims.get(item, ())) for item in seaweed], float)
+        centerx, centery = self.centers()
+        views = self.views
+        for start in range(0, len(rows), self.TARGET_BATCH):
+            batch = rows[start:start + self.TARGET_BATCH]
+            dx = sx - centerx[batch, None]
+            dy = sy - centery[batch, None]
+            cost = np.sqrt(dx * dx + dy * dy) * index.DISTANCE_COST + claims * index.CLAIM_COST
+            choices = cost.argmin(axis=1)
+            for row, choice in zip(batch.tolist(), choices.tolist()):
+                index.retarget(views[row], seaweed[choice])
+            np.add.at(claims, choices, 1)
+
+    def near_seaweed(self, index):
+        """Rows whose inflated rect could touch an indexed seaweed"""
+        n = self.size
+        bounds = index.get_bounds()
+        if bounds is None:
+            return np.zeros(n, bool)
+        bx0, by0, bx1, by1 = bounds
+        occupied = np.zeros((by1 - by0 + 2, bx1 - bx0 + 2), np.int32)
+        for gx, gy in index.cells:
+            occupied[gy - by0 + 1, gx - bx0 + 1] = 1
+        counts = occupied.cumsum(0).cumsum(1)
+        left = self.column("left")
+        top = self.column("top")
+        right = left + self.column("width")
+        bottom = top + self.column("height")
+        # Inflate(20, 20) plus the seaweed padding SeaweedIndex.colliding uses
+        cell = index.cell_size
+        x0 = ((left - 20) // cell).astype(int)
+        x1 = ((right + 20) // cell).astype(int)
+        y0 = ((top - 30) // cell).astype(int)
+        y1 = ((bottom + 30) // cell).astype(int)
+        valid = (x0 <= bx1) & (x1 >= bx0) & (y0 <= by1) & (y1 >= by0)
+        x0 = np.clip(x0, bx0, bx1) - bx0
+        x1 = np.clip(x1, bx0, bx1) - bx0
+        y0 = np.clip(y0, by0, by1) - by0
+        y1 = np.clip(y1, by0, by1) - by0
+        total = counts[y1 + 1, x1 + 1] - counts[y0, x1 + 1] - counts[y1 + 1, x0] + counts[y0, x0]
+        return valid & (total > 0)
+
+    def step(self, dt, now):
+        """Advance movement, animation, hunger, breed timers and rotation"""
+        n = self.size
+        if not n:
+            return
+        rng = self.rng
+        col = self.column
+        left, top, width, height = col("left"), col("top"), col("width"), col("height")
+        speed_x, speed_y = col("speed_x"), col("speed_y")
+        hunger, stage = col("hunger"), col("stage")
+        pause_timer, swim_duration = col("pause_timer"), col("swim_duration")
+        is_hungry, has_target = col("is_hungry"), col("has_target")
+        moving = ~self.breeding_mask()
+
+        # Swim/pause cycle
+        pause_timer += np.where(moving, dt, 0.0)
+        reset = moving & (pause_timer > swim_duration)
+        slow = moving & ~reset & (pause_timer > swim_duration - 1.0)
+        count = int(reset.sum())
+        if count:
+            pause_timer[reset] = 0
+            swim_duration[reset] = rng.uniform(2.0, 5.0, count)
+            col("pause_duration")[reset] = rng.uniform(1.0, 3.0, count)
+            hungry = is_hungry[reset]
+            new_x = np.where(hungry, rng.uniform(-FISH_SPEED * 0.7, FISH_SPEED * 0.7, count),
+                             rng.uniform(-FISH_SPEED, FISH_SPEED, count))
+            new_x[~hungry & (new_x == 0)] = FISH_SPEED
+            new_y = np.where(hungry, rng.uniform(-FISH_SPEED * 0.2, FISH_SPEED * 0.2, count),
+                             rng.uniform(-FISH_SPEED * 0.3, FISH_SPEED * 0.3, count))
+            speed_x[reset] = new_x
+            speed_y[reset] = new_y
+        speed_x[slow] *= 0.9
+        speed_y[slow] *= 0.9
+
+        # Move toward seaweed if hungry
+        steer = moving & is_hungry & has_target
+        if steer.any():
+            dx = col("target_x")[steer] - (left[steer] + width[steer] // 2)
+            dy = col("target_y")[steer] - (top[steer] + height[steer] // 2)
+            dist = np.hypot(dx, dy)
+            far = dist > 5
+            dist[~far] = 1.0
+            boost = np.minimum(1.3, 1.0 + (hunger[steer] - 30) / 70)
+            speed_x[steer] = np.where(far, (dx / dist) * (FISH_SPEED * 0.7) * boost, 0.0)
+            speed_y[steer] = np.where(far, (dy / dist) * (FISH_SPEED * 0.3) * boost, 0.0)
+
+        # Speed variation
+        chasing = (hunger > 30) & has_target
+        target_speed = np.where(chasing, 0.8 + hunger * 0.03, 0.5 + math.sin(now * 0.5) * 0.1)
+        target_speed *= 1.0 + (1.0 - np.minimum(stage / 4, 1.0)) * 0.3
+        current_speed = col("current_speed")
+        current_speed += np.where(moving, (target_speed - current_speed) * 0.1, 0.0)
+        movement_timer = col("movement_timer")
+        movement_timer += np.where(moving, dt, 0.0)
+        vary = moving & (movement_timer > rng.uniform(0.8, 1.2, n))
+        count = int(vary.sum())
+        if count:
+            movement_timer[vary] = 0
+            col("speed_variation")[vary] = rng.uniform(0.85, 1.15, count)
+        effective_speed = current_speed * col("speed_variation")
+
+        # Update position, rounding half away from zero like pygame.Rect does
+        new_left = left + speed_x * effective_speed * 60 * dt
+        new_top = top + speed_y * effective_speed * 60 * dt
+        left[:] = np.where(moving, np.copysign(np.floor(np.abs(new_left) + 0.5), new_left), left)
+        top[:] = np.where(moving, np.copysign(np.floor(np.abs(new_top) + 0.5), new_top), top)
+
+        # Boundary checks
+        hit = moving & (left < 0)
+        left[hit] = 0
+        speed_x[hit] = np.abs(speed_x[hit]) * 0.8
+        hit = moving & ~hit & (left + width > SCREEN_WIDTH)
+        left[hit] = SCREEN_WIDTH - width[hit]
+        speed_x[hit] = -np.abs(speed_x[hit]) * 0.8
+        hit = moving & (top < 0)
+        top[hit] = 0
+        speed_y[hit] = np.abs(speed_y[hit]) * 0.8
+        hit = moving & ~hit & (top + height > SCREEN_HEIGHT)
+        top[hit] = SCREEN_HEIGHT - height[hit]
+        speed_y[hit] = -np.abs(speed_y[hit]) * 0.8
+
+        # Animation updates
+        animation_timer = col("animation_timer")
+        animation_timer += dt
+        tick = animation_timer >= FishView.animation_speed
+        if tick.any():
+            animation_frame, current_row = col("animation_frame"), col("current_row")
+            animation_timer[tick] = 0
+            animation_frame[tick] = (animation_frame[tick] + 1) % 3
+            row = np.where(speed_y < -0.2, 0, np.where(speed_y > 0.2, 2, 1))
+            current_row[tick] = row[tick]
+            col("base_row")[tick] = current_row[tick]
+            col("base_col")[tick] = animation_frame[tick]
+
+        # Update hunger and breeding timer
+        hunger += dt * hunger_rate(stage)
+        breed_timer = col("breed_timer")
+        breed_timer -= np.where(breed_timer > 0, dt, 0.0)
+
+        # Update rotation and recentre rects on the pose size
+        angle = col("current_angle")
+        turning = (speed_x != 0) | (speed_y != 0)
+        movement_angle = np.degrees(np.arctan2(-speed_y, np.abs(speed_x)))
+        target_angle = np.where(np.abs(speed_y) < 0.1, 0.0, np.clip(movement_angle, -MAX_FISH_ANGLE, MAX_FISH_ANGLE))
+        angle += np.where(turning, (target_angle - angle) * 0.15, 0.0)
+        flipped = speed_x < 0
+        rotation = np.where(flipped, -angle, angle)
+        half = frame_cache.angle_slots // 2
+        slot = np.clip(np.round(rotation / frame_cache.angle_step).astype(int) + half, 0, frame_cache.angle_slots - 1)
+        sizes = self.pose_sizes[col("sprite"), col("base_row"), col("base_col"), flipped.astype(int), slot]
+        centerx = left + width // 2
+        centery = top + height // 2
+        width[:] = sizes[:, 0]
+        height[:] = sizes[:, 1]
+        left[:] = centerx - width // 2
+        top[:] = centery - height // 2
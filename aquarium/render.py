@@ -0,0 +1,245 @@
+"""Frame profiler, render caches, dirty-rect helpers and buttons."""
+import collections
+import json
+import time
+
+import pygame
+
+from .config import BLACK, GREEN, RED, WHITE, YELLOW
+from .logs import log
+from .assets import get_font
+
+
+# Frame profiler
+class FrameProfiler:
+    """Per-phase timings for update() and draw(), plus a rolling frame history.
+
+    Callers mark phase boundaries with lap(); each lap charges the time
+    since the previous mark to that phase, so phases interleaved per fish
+    still add up. Every call site checks enabled first, which is the only
+    cost when profiling is off. When a trace is being recorded, each frame
+    becomes a Chrome-trace event with its phases laid end to end inside it.
+    """
+
+    HISTOGRAM_BUCKETS = (4, 8, 12, 16, 20, 25, 33, 50)  # Upper bounds in ms
+
+    def __init__(self, history=240):
+        self.enabled = False
+        self.show_overlay = False
+        self.frame_times = collections.deque(maxlen=history)
+        self.phases = {}
+        self.last_phases = {}
+        self.trace_events = None
+        self.mark = 0.0
+        self.frame_start = None
+
+    def begin(self):
+        self.mark = time.perf_counter()
+        if self.frame_start is None:
+            self.frame_start = self.mark
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.mark)
+        self.mark = now
+
+    def end_frame(self):
+        """Close the current frame and roll its phase totals into history"""
+        if self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.frame_times.append(end - self.frame_start)
+        if self.trace_events is not None:
+            ts = self.frame_start * 1e6
+            self.trace_events.append({"name": "frame", "ph": "X", "ts": ts,
+                                      "dur": (end - self.frame_start) * 1e6, "pid": 0, "tid": 0})
+            for phase, seconds in self.phases.items():
+                self.trace_events.append({"name": phase, "ph": "X", "ts": ts,
+                                          "dur": seconds * 1e6, "pid": 0, "tid": 0})
+                ts += seconds * 1e6
+        self.last_phases = self.phases
+        self.phases = {}
+        self.frame_start = None
+
+    def start_trace(self):
+        self.enabled = True
+        self.trace_events = []
+
+    def dump_trace(self, path):
+        """Write recorded frames as a Chrome trace (chrome://tracing, Perfetto)"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events or [], "displayTimeUnit": "ms"}, f)
+        log.info("Wrote %d trace events to %s", len(self.trace_events or []), path)
+
+    def histogram(self):
+        counts = [0] * (len(self.HISTOGRAM_BUCKETS) + 1)
+        for seconds in self.frame_times:
+            ms = seconds * 1000
+            for i, bound in enumerate(self.HISTOGRAM_BUCKETS):
+                if ms < bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def overlay_rect(self, x, y):
+        return pygame.Rect(x, y, 250, 70 + 16 * min(len(self.last_phases), 8))
+
+    def draw_overlay(self, surface, x, y):
+        """Frame-time histogram and the slowest phases of the last frame.
+
+        Text goes through text_cache; phase names and their timings are
+        cached apart, since a name repeats every frame but its time rarely does.
+        """
+        font = get_font(20)
+        counts = self.histogram()
+        peak = max(counts) or 1
+        labels = [f"<{bound}" for bound in self.HISTOGRAM_BUCKETS] + [f">{self.HISTOGRAM_BUCKETS[-1]}"]
+        pygame.draw.rect(surface, BLACK, self.overlay_rect(x, y))
+        for i, count in enumerate(counts):
+            height = int(40 * count / peak)
+            color = GREEN if i < 4 else YELLOW if i < 6 else RED
+            pygame.draw.rect(surface, color, (x + 5 + i * 27, y + 45 - height, 22, height))
+            surface.blit(text_cache.render(font, labels[i], WHITE), (x + 5 + i * 27, y + 48))
+        if self.frame_times:
+            average = 1000 * sum(self.frame_times) / len(self.frame_times)
+            surface.blit(text_cache.render(font, f"{average:.1f} ms avg", WHITE), (x + 150, y + 3))
+        slowest = sorted(self.last_phases.items(), key=lambda item: -item[1])[:8]
+        for i, (phase, seconds) in enumerate(slowest):
+            name = text_cache.render(font, f"{phase}: ", WHITE)
+            timing = text_cache.render(font, f"{seconds * 1000:.2f} ms", WHITE)
+            surface.blit(name, (x + 5, y + 66 + i * 16))
+            surface.blit(timing, (x + 5 + name.get_width(), y + 66 + i * 16))
+
+# Text surface cache
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color).
+
+    HUD values, button labels, menu entries and sell-mode price tags repeat
+    from frame to frame, so almost every render becomes a dict hit.
+    """
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.surfaces = collections.OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+class TileCache:
+    """LRU cache of plain filled and outlined Surfaces.
+
+    Seaweed, hunger bars, fish without frames and selection outlines come
+    in a small set of sizes and colours. Blitting a pre-rendered tile lets
+    them join their layer's Surface.blits call instead of costing a draw
+    call each.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.tiles = collections.OrderedDict()
+
+    def get(self, size, color, width=0):
+        """A size tile filled with color, or just a width-pixel border of it"""
+        key = (size, color, width)
+        tile = self.tiles.get(key)
+        if tile is None:
+            if width:
+                tile = pygame.Surface(size, pygame.SRCALPHA)
+                draw_outline(tile, color, tile.get_rect(), width)
+            else:
+                tile = pygame.Surface(size)
+                tile.fill(color)
+            if pygame.display.get_surface() is not None:
+                tile = tile.convert_alpha() if width else tile.convert()
+            self.tiles[key] = tile
+            if len(self.tiles) > self.capacity:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(key)
+        return tile
+
+    def clear(self):
+        self.tiles.clear()
+
+
+tile_cache = TileCache()
+
+
+def merge_rects(rects, bounds):
+    """Clip rects to bounds and union overlapping ones until none overlap"""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.width or not rect.height:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+def draw_outline(surface, color, rect, width):
+    """Same as pygame.draw.rect with a border width, but built from fills.
+
+    draw.rect outlines the rect after clipping it, so under a clip rect it
+    leaves borders along the clip edges; fills clip per pixel.
+    """
+    x, y, w, h = rect
+    surface.fill(color, (x, y, w, width))
+    surface.fill(color, (x, y + h - width, w, width))
+    surface.fill(color, (x, y, width, h))
+    surface.fill(color, (x + w - width, y, width, h))
+
+# Button class
+class Button:
+    def __init__(self, x, y, width, height, text):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+
+    def draw(self, surface, font):
+        pygame.draw.rect(surface, (50, 50, 50), self.rect)
+        text = text_cache.render(font, self.text, WHITE)
+        surface.blit(text, (self.rect.x + 10, self.rect.y + 10))
+
+# BreedButton class
+class BreedButton:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 90, 40)
+        self.text = "Breed"
+        self.active = False
+
+    def draw(self, surface, font):
+        color = GREEN if self.active else (100, 100, 100)
+        pygame.draw.rect(surface, color, self.rect)
+        text = text_cache.render(font, self.text, WHITE)
+        surface.blit(text, (self.rect.x + 10, self.rect.y + 10))
+
+# ShopButton class
+class ShopButton:
+    def __init__(self, x, y):
+        self.width = 40
+        self.height = 40
+        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.color = YELLOW
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, self.color, self.rect)
@@ -0,0 +1,84 @@
+"""Recording play sessions and replaying them exactly."""
+import json
+
+from .sim import Fish, Seaweed
+from .game import AquariumGame
+from .snapshots import load_snapshot
+
+
+# Session recording and replay
+SESSION_VERSION = 1
+
+
+class SessionRecorder:
+    """Writes a play session as JSON lines for exact replay.
+
+    The first line holds the seed and starting state. Every later line is
+    one frame: the dt passed to update(), then the player actions performed
+    before that update as [action, sim time, args...], with fish stored as
+    {"fish": id}. Same seed, same actions, same dts: same session.
+    """
+
+    def __init__(self, path, game, snapshot=None):
+        # Line buffered, so a crashed or killed session still replays up to the end
+        self.file = open(path, "w", buffering=1)
+        self.actions = []
+        header = {
+            "version": SESSION_VERSION,
+            "seed": game.seed,
+            "backend": "objects" if game.population is None else "numpy",
+            "time_scale": game.time_scale,
+            "fish_avoidance": game.fish_avoidance,
+            "next_fish_id": Fish._id_counter,
+            "next_seaweed_id": Seaweed._id_counter,
+            "snapshot": snapshot,
+        }
+        self.file.write(json.dumps(header) + "\n")
+        game.recorder = self
+
+    def record(self, now, action, args):
+        args = [{"fish": arg.id} if isinstance(arg, Fish) else arg for arg in args]
+        self.actions.append([action, now, *args])
+
+    def frame(self, dt):
+        """Write the frame about to be updated by dt, with its actions"""
+        self.file.write(json.dumps([dt, *self.actions]) + "\n")
+        self.actions = []
+
+    def close(self):
+        self.file.close()
+
+
+class SessionReplay:
+    """Plays a recorded session back into a new game, one frame per step()"""
+
+    def __init__(self, path, headless=True):
+        self.file = open(path)
+        header = json.loads(self.file.readline())
+        if header.get("version") != SESSION_VERSION:
+            raise ValueError(f"Unsupported session version {header.get('version')} in {path}")
+        if header["snapshot"]:
+            self.game, _ = load_snapshot(header["snapshot"], headless=headless, backend=header["backend"])
+        else:
+            self.game = AquariumGame(headless=headless, backend=header["backend"])
+        self.game.reseed(header["seed"])
+        self.game.time_scale = header["time_scale"]
+        self.game.fish_avoidance = header.get("fish_avoidance", False)
+        Fish._id_counter = header["next_fish_id"]
+        Seaweed._id_counter = header["next_seaweed_id"]
+        self.frames = 0
+
+    def step(self):
+        """Replay the next frame; False once the recording is over"""
+        line = self.file.readline()
+        if not line:
+            self.file.close()
+            return False
+        game = self.game
+        dt, *actions = json.loads(line)
+        for action, when, *args in actions:
+            args = [game.fish_list.get(arg["fish"]) if isinstance(arg, dict) else arg for arg in args]
+            game.perform(action, *args)
+        game.update(dt)
+        self.frames += 1
+        return True
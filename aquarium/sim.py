@@ -0,0 +1,991 @@
+"""Simulation clock, fish timers, auto feed planning, species, fish, seaweed, entity stores, indexes and stats."""
+import collections
+import heapq
+import math
+import operator
+
+import pygame
+
+from .config import (
+    FISH_CELL_SIZE,
+    FISH_SPEED,
+    GREEN,
+    MAX_FISH_ANGLE,
+    POOL_SIZE,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SEAWEED_CELL_SIZE,
+)
+from .logs import debug_log, log_breeding, log_hunger, log_movement
+from .assets import frame_cache, stage_size_multiplier
+
+
+def hunger_rate(stage):
+    """Hunger gained per simulated second at a given stage"""
+    return 0.5 + (stage - 1) * 0.125
+
+
+# Simulation clock
+class SimClock:
+    """Simulated seconds, advanced by AquariumGame.update at the scaled rate.
+
+    Every fish timer reads this instead of time.time(), so time_scale and
+    headless stepping speed up breeding and eating along with movement.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def advance(self, dt):
+        self.now += dt
+        return self.now
+
+# Fish timer scheduler
+class TimerScheduler:
+    """Priority queue of fish timers on the simulation clock.
+
+    Instead of every fish polling its timers each frame, fish register the
+    moments their state changes: turning hungry (30) and starving (150),
+    the eat cooldown running out, babies being due and a courtship
+    completing. run() pops only the due events, so most fish do no timer
+    work on most frames. The resulting state is kept in the hungry,
+    starving and digesting groups (dicts used as insertion-ordered sets).
+
+    Rescheduling a fish gives it a new version from one counter shared by
+    all fish; its older queued events go stale and are skipped once they
+    reach the front of the queue. A pooled fish that comes back can't
+    match events from its previous life.
+    """
+
+    LEVELS = (("hungry", 30), ("starving", 150))
+
+    def __init__(self, game):
+        self.game = game
+        self.events = []
+        self.seq = 0
+        self.version = {}
+        self.last_version = 0
+        self.hungry = {}
+        self.starving = {}
+        self.digesting = {}
+
+    def add(self, fish):
+        self.version[fish] = 0
+        self.reschedule(fish)
+
+    def discard(self, fish):
+        if self.version.pop(fish, None) is not None:
+            for group in (self.hungry, self.starving, self.digesting):
+                group.pop(fish, None)
+
+    def push(self, when, kind, fish, version, arg=None):
+        heapq.heappush(self.events, (when, self.seq, kind, fish, version, arg))
+        self.seq += 1
+
+    def reschedule(self, fish):
+        """Recompute a tracked fish's groups and queue its next events"""
+        if fish not in self.version:
+            return
+        self.last_version += 1
+        version = self.version[fish] = self.last_version
+        for name, threshold in self.LEVELS:
+            getattr(self, name).pop(fish, None)
+        self.queue_hunger(fish, 0, version)
+        ready_at = fish.last_eat_time + fish.eat_cooldown
+        if ready_at > self.game.sim_clock.now:
+            self.digesting[fish] = True
+            self.push(ready_at, "cooldown", fish, version)
+        else:
+            self.digesting.pop(fish, None)
+        if fish.is_fertilized:
+            self.push(fish.breed_due, "birth", fish, version)
+
+    def queue_hunger(self, fish, level, version):
+        """Join every hunger group from level up that fish has reached, then queue the next"""
+        hunger = fish.hunger
+        for name, threshold in self.LEVELS[level:]:
+            if hunger < threshold:
+                when = self.game.sim_clock.now + (threshold - hunger) / fish.hunger_per_second
+                self.push(when, "hunger", fish, version, level)
+                return
+            getattr(self, name)[fish] = True
+            level += 1
+
+    def schedule_mate(self, fish):
+        """Queue the end of the courtship fish just started"""
+        if fish in self.version:
+            start = fish.collision_start_time
+            self.push(start + fish.required_collision_time, "mate", fish, None, start)
+
+    def run(self, now):
+        """Handle every event due by now; returns how many were handled"""
+        events = self.events
+        handled = 0
+        while events and events[0][0] <= now:
+            when, _, kind, fish, version, arg = heapq.heappop(events)
+            if version is not None and version != self.version.get(fish):
+                continue
+            getattr(self, "on_" + kind)(fish, arg)
+            handled += 1
+        return handled
+
+    def on_hunger(self, fish, level):
+        # The event itself marks the crossing, so float error in the
+        # recomputed hunger can't requeue it
+        getattr(self, self.LEVELS[level][0])[fish] = True
+        self.queue_hunger(fish, level + 1, self.version[fish])
+
+    def on_cooldown(self, fish, arg):
+        self.digesting.pop(fish, None)
+
+    def on_birth(self, fish, arg):
+        for baby in fish.spawn_babies():
+            self.game.add_fish(baby)
+
+    def on_mate(self, fish, start):
+        if fish in self.version and fish.breeding_partner and fish.collision_start_time == start:
+            fish.finish_breeding()
+
+# Auto feed planner
+class AutoFeedPlanner:
+    """Buys seaweed for auto feed in batches, ahead of need.
+
+    Every PLAN_INTERVAL seconds it forecasts the meals fish will want
+    before the next plan and buys the shortfall in shop tiers. The stock is
+    reserved: only hungry fish eat it, so well-fed fish can't graze it away.
+    """
+
+    HUNGRY = 30  # Fish start looking for seaweed
+    PLAN_INTERVAL = 10.0
+    HORIZON = 10.0  # Stock for meals due before the next plan
+    TIERS = (100, 10, 1)  # The shop's seaweed buttons
+
+    def __init__(self, game):
+        self.game = game
+
+    def update(self, now, dt):
+        """Plan if this tick crossed a multiple of PLAN_INTERVAL on the sim clock"""
+        # Read off the clock, so a tank loaded from a snapshot plans when the saved one would have
+        if now // self.PLAN_INTERVAL == (now - dt) // self.PLAN_INTERVAL:
+            return
+        self.buy(self.forecast(now) - len(self.game.seaweed_list))
+
+    def forecast(self, now):
+        """Meals the tank's fish will want in the next HORIZON seconds"""
+        meals = 0
+        for fish in self.game.fish_list:
+            rate = hunger_rate(fish.stage)
+            cooldown = fish.eat_cooldown
+            first = max((self.HUNGRY - fish.hunger) / rate, fish.last_eat_time + cooldown - now, 0.0)
+            if first <= self.HORIZON:
+                meals += 1 + int((self.HORIZON - first) // max(self.HUNGRY / rate, cooldown))
+        return meals
+
+    def buy(self, shortfall):
+        game = self.game
+        price = game.shop_items["Seaweed"]
+        shortfall = min(shortfall, int(game.coins // price)) if price > 0 else shortfall
+        for tier in self.TIERS:
+            batches, shortfall = divmod(max(shortfall, 0), tier)
+            if batches:
+                game.buy_seaweed(batches * tier, reserved=True)
+
+# Fish species
+class Species:
+    """Constants shared by every fish of one type"""
+
+    __slots__ = ("name", "color", "max_stage", "food_needed", "breed_cooldown", "breed_delay",
+                 "required_collision_time", "eat_cooldown", "base_width", "base_height")
+
+    def __init__(self, name, color, max_stage=5, food_needed=(3, 5, 7, 10, 0),
+                 breed_cooldown=600, breed_delay=120, required_collision_time=2,
+                 eat_cooldown=5.0, base_width=40, base_height=30):
+        self.name = name
+        self.color = color  # Drawn when the sprite frames are missing
+        self.max_stage = max_stage
+        self.food_needed = food_needed  # Meals to leave each stage
+        self.breed_cooldown = breed_cooldown  # 10 minutes
+        self.breed_delay = breed_delay  # 2 minutes from mating to babies
+        self.required_collision_time = required_collision_time
+        self.eat_cooldown = eat_cooldown
+        self.base_width = base_width
+        self.base_height = base_height
+
+
+SPECIES = {
+    "Guppy": Species("Guppy", (255, 69, 0)),  # Orange
+    "Tetra": Species("Tetra", (255, 215, 0)),  # Yellow
+}
+
+
+def species_constant(name):
+    """Read-only fish attribute looked up on the fish's species"""
+    return property(operator.attrgetter("species." + name))
+
+# Fish class
+class Fish:
+    _id_counter = 0  # Class-level counter for unique IDs
+
+    __slots__ = (
+        "id", "game", "type", "species", "stage", "gender", "food_eaten",
+        "hunger_base", "hunger_since", "hunger_per_second", "breed_due", "is_fertilized",
+        "breeding_partner", "collision_start_time", "last_breed_time", "last_eat_time",
+        "rect", "speed_x", "speed_y", "current_speed", "speed_variation", "movement_timer",
+        "pause_timer", "swim_duration", "pause_duration", "target_seaweed", "is_hungry",
+        "animation_frames", "animation_frame", "animation_timer", "current_row",
+        "current_angle", "base_image", "image",
+    )
+
+    max_stage = species_constant("max_stage")
+    food_needed = species_constant("food_needed")
+    breed_cooldown = species_constant("breed_cooldown")
+    breed_delay = species_constant("breed_delay")
+    required_collision_time = species_constant("required_collision_time")
+    eat_cooldown = species_constant("eat_cooldown")
+    base_width = species_constant("base_width")
+    base_height = species_constant("base_height")
+    animation_speed = 0.15
+    is_paused = False
+    time_scale = 1.0
+
+    def __init__(self, game, x, y, fish_type="Guppy", stage=1):
+        self.id = Fish._id_counter  # Assign unique ID
+        Fish._id_counter += 1
+        self.game = game
+        self.type = fish_type
+        self.species = SPECIES[fish_type]
+        self.stage = stage
+        rng = game.rng
+        self.gender = rng.choice(["male", "female"])
+        self.hunger_per_second = hunger_rate(stage)
+        self.hunger = 0
+        self.food_eaten = 0
+        self.breeding_partner = None
+        self.collision_start_time = 0
+        self.breed_timer = 0
+        self.is_fertilized = False
+        self.last_breed_time = game.sim_clock.now
+        self.speed_x = rng.uniform(-FISH_SPEED, FISH_SPEED) or FISH_SPEED
+        self.speed_y = rng.uniform(-FISH_SPEED * 0.3, FISH_SPEED * 0.3)
+        self.rect = pygame.Rect(x, y, self.base_width, self.base_height)
+        self.last_eat_time = game.sim_clock.now
+        self.animation_frame = 0
+        self.animation_timer = 0
+        self.animation_frames = []
+        self.current_row = 2
+        self.current_angle = 0
+        # Feeding and movement attributes from provided code
+        self.target_seaweed = None
+        self.is_hungry = False
+        self.pause_timer = 0
+        self.swim_duration = rng.uniform(2.0, 5.0)
+        self.pause_duration = rng.uniform(1.0, 3.0)
+        self.current_speed = 0.5
+        self.movement_timer = 0
+        self.speed_variation = 1.0
+
+        # Load animation frames
+        self.load_animation_frames(self.sprite_folder())
+
+        self.base_image = self.animation_frames[1][0] if self.animation_frames else None
+        if self.base_image:
+            self.image = self.base_image
+            self.rect = self.image.get_rect(center=(x, y))
+        else:
+            self.image = None
+            self.rect = pygame.Rect(x - 25, y - 15, 50, 30)
+
+        if debug_log.breeding:
+            log_breeding.debug("Created fish ID %d, Type: %s, Stage: %d, Gender: %s", self.id, self.type, self.stage, self.gender)
+
+    @property
+    def size_multiplier(self):
+        return stage_size_multiplier(self.stage)
+
+    @property
+    def hunger(self):
+        """Read off the clock: hunger at hunger_since plus the rate since then"""
+        return self.hunger_base + self.hunger_per_second * (self.game.sim_clock.now - self.hunger_since)
+
+    @hunger.setter
+    def hunger(self, value):
+        self.hunger_base = value
+        self.hunger_since = self.game.sim_clock.now
+        self.game.timers.reschedule(self)
+
+    @property
+    def breed_timer(self):
+        """Seconds until a fertilized female's babies are due"""
+        return max(0.0, self.breed_due - self.game.sim_clock.now)
+
+    @breed_timer.setter
+    def breed_timer(self, value):
+        self.breed_due = self.game.sim_clock.now + value
+        self.game.timers.reschedule(self)
+
+    def sprite_folder(self, growing=False):
+        """Asset folder for this fish's type, gender and stage"""
+        if self.type == "Guppy":
+            if self.stage == 1:
+                return "guppy_baby"
+            return "guppy_female" if self.gender == "female" else "guppy"
+        return self.type.lower() if growing else f"{self.type.lower()}_baby"
+
+    def load_animation_frames(self, folder_name):
+        """Point this fish at the shared frames for its folder and stage"""
+        self.animation_frames = frame_cache.get(folder_name, self.size_multiplier)
+
+    def update(self, dt):
+        if self.is_paused:
+            if debug_log.movement:
+                log_movement.debug("Fish ID %d is paused", self.id)
+            return
+
+        scaled_dt = max(dt * self.time_scale, 0.001)
+        rng = self.game.rng
+
+        # Handle breeding movement
+        if self.breeding_partner:
+            self.update_breeding()
+        else:
+            # Movement logic from provided code
+            self.pause_timer += scaled_dt
+            if self.pause_timer > self.swim_duration:
+                self.pause_timer = 0
+                self.swim_duration = rng.uniform(2.0, 5.0)
+                self.pause_duration = rng.uniform(1.0, 3.0)
+                if self.is_hungry:
+                    self.speed_x = rng.uniform(-FISH_SPEED * 0.7, FISH_SPEED * 0.7)
+                    self.speed_y = rng.uniform(-FISH_SPEED * 0.2, FISH_SPEED * 0.2)
+                else:
+                    self.speed_x = rng.uniform(-FISH_SPEED, FISH_SPEED) or FISH_SPEED
+                    self.speed_y = rng.uniform(-FISH_SPEED * 0.3, FISH_SPEED * 0.3)
+            elif self.pause_timer > self.swim_duration - 1.0:
+                self.speed_x *= 0.9
+                self.speed_y *= 0.9
+
+            # Move toward seaweed if hungry
+            if self.is_hungry and self.target_seaweed:
+                dx = self.target_seaweed.rect.centerx - self.rect.centerx
+                dy = self.target_seaweed.rect.centery - self.rect.centery
+                dist = math.hypot(dx, dy)
+                if dist > 5:
+                    hunger_speed_boost = min(1.3, 1.0 + (self.hunger - 30) / 70)
+                    self.speed_x = (dx / dist) * (FISH_SPEED * 0.7) * hunger_speed_boost
+                    self.speed_y = (dy / dist) * (FISH_SPEED * 0.3) * hunger_speed_boost
+                else:
+                    self.speed_x = 0
+                    self.speed_y = 0
+
+            # Speed variation
+            base_speed = 0.5
+            if self.target_seaweed and self.hunger > 30:
+                target_speed = 0.8 + (self.hunger * 0.03)
+            else:
+                target_speed = base_speed + (math.sin(self.game.sim_clock.now * 0.5) * 0.1)
+            size_factor = 1.0 + (1.0 - min(self.stage / 4, 1.0)) * 0.3
+            target_speed *= size_factor
+            self.current_speed += (target_speed - self.current_speed) * 0.1
+            self.movement_timer += scaled_dt
+            if self.movement_timer > rng.uniform(0.8, 1.2):
+                self.movement_timer = 0
+                self.speed_variation = rng.uniform(0.85, 1.15)
+            effective_speed = self.current_speed * self.speed_variation
+
+            # Update position
+            self.rect.x += self.speed_x * effective_speed * 60 * scaled_dt
+            self.rect.y += self.speed_y * effective_speed * 60 * scaled_dt
+
+            # Boundary checks
+            if self.rect.left < 0:
+                self.rect.left = 0
+                self.speed_x = abs(self.speed_x) * 0.8
+                if debug_log.movement:
+                    log_movement.debug("Fish ID %d hit left boundary", self.id)
+            elif self.rect.right > SCREEN_WIDTH:
+                self.rect.right = SCREEN_WIDTH
+                self.speed_x = -abs(self.speed_x) * 0.8
+                if debug_log.movement:
+                    log_movement.debug("Fish ID %d hit right boundary", self.id)
+            if self.rect.top < 0:
+                self.rect.top = 0
+                self.speed_y = abs(self.speed_y) * 0.8
+                if debug_log.movement:
+                    log_movement.debug("Fish ID %d hit top boundary", self.id)
+            elif self.rect.bottom > SCREEN_HEIGHT:
+                self.rect.bottom = SCREEN_HEIGHT
+                self.speed_y = -abs(self.speed_y) * 0.8
+                if debug_log.movement:
+                    log_movement.debug("Fish ID %d hit bottom boundary", self.id)
+
+        # Animation updates
+        if self.animation_frames:
+            self.animation_timer += scaled_dt
+            if self.animation_timer >= self.animation_speed:
+                self.animation_timer = 0
+                self.animation_frame = (self.animation_frame + 1) % 3
+                if self.speed_y < -0.2:
+                    target_row = 0
+                elif self.speed_y > 0.2:
+                    target_row = 2
+                else:
+                    target_row = 1
+                if target_row != self.current_row:
+                    self.current_row = target_row
+                self.base_image = self.animation_frames[self.current_row][self.animation_frame]
+
+        # Update image and rotation
+        if self.speed_x != 0 or self.speed_y != 0:
+            movement_angle = math.degrees(math.atan2(-self.speed_y, abs(self.speed_x)))
+            target_angle = 0 if abs(self.speed_y) < 0.1 else max(min(movement_angle, MAX_FISH_ANGLE), -MAX_FISH_ANGLE)
+            self.current_angle += (target_angle - self.current_angle) * 0.15
+        if self.base_image:
+            flipped = self.speed_x < 0
+            rotation_angle = -self.current_angle if flipped else self.current_angle
+            self.image = frame_cache.pose(self.base_image, flipped, rotation_angle)
+            self.rect = self.image.get_rect(center=self.rect.center)
+
+    def update_breeding(self):
+        """Steer toward the breeding partner"""
+        dx = self.breeding_partner.rect.centerx - self.rect.centerx
+        dy = self.breeding_partner.rect.centery - self.rect.centery
+        dist = math.hypot(dx, dy)
+        if dist > 5:
+            self.speed_x = (dx / dist) * FISH_SPEED * 0.5
+            self.speed_y = (dy / dist) * FISH_SPEED * 0.5
+        else:
+            self.speed_x = 0
+            self.speed_y = 0
+
+    def finish_breeding(self):
+        """Complete the courtship: fertilize the female and start both cooldowns"""
+        current_time = self.game.sim_clock.now
+        partner = self.breeding_partner
+        rng = self.game.rng
+        log_breeding.info("Breeding complete for Fish ID %d with Partner ID %d", self.id, partner.id)
+        self.game.breeding_in_progress = False
+        self.game.selected_fish_1 = None
+        self.game.selected_fish_2 = None
+        for fish in (self, partner):
+            if fish.gender == "female":
+                fish.is_fertilized = True
+                fish.breed_timer = fish.breed_delay
+            fish.last_breed_time = current_time
+            fish.breeding_partner = None
+            fish.collision_start_time = 0
+            # Resume normal movement
+            fish.speed_x = rng.uniform(-FISH_SPEED, FISH_SPEED) or FISH_SPEED
+            fish.speed_y = rng.uniform(-FISH_SPEED * 0.3, FISH_SPEED * 0.3)
+
+    def collide_with_fish(self, other_fish):
+        """Handle collision only for selected breeding pairs"""
+        current_time = self.game.sim_clock.now
+        if not (self.game.selected_fish_1 and self.game.selected_fish_2):
+            return
+
+        if not (self == self.game.selected_fish_1 and other_fish == self.game.selected_fish_2 or
+                self == self.game.selected_fish_2 and other_fish == self.game.selected_fish_1):
+            return
+
+        can_breed = (
+            self.stage == 5 and
+            other_fish.stage == 5 and
+            self.gender != other_fish.gender and
+            current_time - self.last_breed_time >= self.breed_cooldown and
+            current_time - other_fish.last_breed_time >= other_fish.breed_cooldown
+        )
+
+        if can_breed:
+            if self.breeding_partner is not other_fish:
+                self.collision_start_time = current_time
+                self.breeding_partner = other_fish
+                other_fish.breeding_partner = self
+                other_fish.collision_start_time = current_time
+                self.game.timers.schedule_mate(self)
+                log_breeding.info("Breeding collision started: Fish ID %d with Fish ID %d", self.id, other_fish.id)
+
+    def spawn_babies(self):
+        """Spawn baby fish when breeding timer is complete"""
+        current_time = self.game.sim_clock.now
+        if (
+            self.stage == 5 and
+            self.gender == "female" and
+            self.is_fertilized and
+            self.breed_timer <= 0
+        ):
+            rng = self.game.rng
+            num_babies = rng.randint(3, 6)
+            babies = []
+            for _ in range(num_babies):
+                baby_x = self.rect.centerx + rng.uniform(-50, 50)
+                baby_y = self.rect.centery + rng.uniform(-50, 50)
+                baby = self.game.create_fish(baby_x, baby_y, "Guppy")
+                babies.append(baby)
+            self.is_fertilized = False
+            self.breed_timer = self.breed_delay
+            self.last_breed_time = current_time
+            log_breeding.info("Fish ID %d spawned %d babies", self.id, num_babies)
+            return babies
+        return []
+
+    def scatter(self):
+        rng = self.game.rng
+        self.speed_x = rng.uniform(-FISH_SPEED * 2, FISH_SPEED * 2) or FISH_SPEED
+        self.speed_y = rng.uniform(-FISH_SPEED * 2, FISH_SPEED * 2)
+        if debug_log.movement:
+            log_movement.debug("Fish ID %d scattered", self.id)
+
+    def grow(self):
+        """Increase the fish's stage if it has eaten enough food"""
+        if self.stage < self.max_stage and self.food_eaten >= self.food_needed[self.stage - 1]:
+            hunger = self.hunger
+            self.stage += 1
+            self.game.population_stats.grew(self, self.stage - 1)
+            # Restart the hunger line at the new stage's rate
+            self.hunger_per_second = hunger_rate(self.stage)
+            self.hunger = hunger
+            self.food_eaten = 0
+            self.load_animation_frames(self.sprite_folder(growing=True))
+            self.base_image = self.animation_frames[1][0] if self.animation_frames else None
+            if self.base_image:
+                self.image = self.base_image
+                self.rect = self.image.get_rect(center=self.rect.center)
+            else:
+                self.image = None
+                self.rect = pygame.Rect(self.rect.x - 25, self.rect.y - 15, 50, 30)
+            log_hunger.info("Fish ID %d grew to stage %d", self.id, self.stage)
+
+    def eat_seaweed(self, seaweed):
+        """Eat seaweed on collision if cooldown allows"""
+        current_time = self.game.sim_clock.now
+        time_since_last_eat = current_time - self.last_eat_time
+        if time_since_last_eat >= self.eat_cooldown:
+            self.last_eat_time = current_time
+            self.hunger = 0
+            self.food_eaten += 1
+            if debug_log.hunger:
+                log_hunger.debug("Fish ID %d ate seaweed! Stage: %d, Food eaten: %d", self.id, self.stage, self.food_eaten)
+            self.grow()
+            return True
+        return False
+
+    def draw(self, surface):
+        if self.image:
+            center = self.rect.center
+            surface.blit(self.image, self.image.get_rect(center=center))
+        else:
+            pygame.draw.rect(surface, self.species.color, self.rect)
+
+    def clear_breeding_state(self):
+        """Clear breeding-related state"""
+        if self.breeding_partner:
+            self.breeding_partner.breeding_partner = None
+            self.breeding_partner.collision_start_time = 0
+        self.breeding_partner = None
+        self.collision_start_time = 0
+        rng = self.game.rng
+        self.speed_x = rng.uniform(-FISH_SPEED, FISH_SPEED) or FISH_SPEED
+        self.speed_y = rng.uniform(-FISH_SPEED * 0.3, FISH_SPEED * 0.3)
+
+# Seaweed class
+class Seaweed:
+    _id_counter = 0  # Class-level counter; ids also break SeaweedIndex ties
+
+    __slots__ = ("id", "rect", "reserved")
+
+    width = 10
+    height = 20
+    color = GREEN
+
+    def __init__(self, x, y, reserved=False):
+        self.id = Seaweed._id_counter
+        Seaweed._id_counter += 1
+        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.reserved = reserved  # Auto feed stock: only hungry fish eat it
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, self.color, self.rect)
+
+# Entity store
+class EntityStore:
+    """Fish or seaweed in play: a list with O(1) swap-removal, id lookup and a spare pool.
+
+    Swap-removal shuffles the list, so drawing and picking use in_order(),
+    which stays in id (creation) order. Removed entities join the pool at
+    release(), the end of the tick, and make() reinitialises them.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE):
+        self.items = []
+        self.slots = {}  # Entity id -> index in items
+        self.ordered = []  # items sorted by id, or None until in_order() re-sorts
+        self.removed = []
+        self.spares = []
+        self.pool_size = pool_size
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __contains__(self, entity):
+        slot = self.slots.get(entity.id)
+        return slot is not None and self.items[slot] is entity
+
+    def get(self, entity_id):
+        """The live entity with this id, or None"""
+        slot = self.slots.get(entity_id)
+        return None if slot is None else self.items[slot]
+
+    def in_order(self):
+        """The entities in id order, which is the order they were created in"""
+        if self.ordered is None:
+            self.ordered = sorted(self.items, key=operator.attrgetter("id"))
+        return self.ordered
+
+    def add(self, entity):
+        self.slots[entity.id] = len(self.items)
+        self.items.append(entity)
+        ordered = self.ordered
+        if ordered is not None:
+            if not ordered or ordered[-1].id < entity.id:
+                ordered.append(entity)
+            else:
+                self.ordered = None
+
+    def remove(self, entity):
+        slot = self.slots.pop(entity.id)
+        last = self.items.pop()
+        if last is not entity:
+            self.items[slot] = last
+            self.slots[last.id] = slot
+        self.ordered = None
+        self.removed.append(entity)
+
+    def release(self):
+        """Pool the entities removed since the last call, up to pool_size spares"""
+        if self.removed:
+            room = self.pool_size - len(self.spares)
+            if room > 0:
+                self.spares.extend(self.removed[:room])
+            self.removed.clear()
+
+    def make(self, cls, *args):
+        """cls(*args), reusing a pooled entity when there is one"""
+        if self.spares:
+            entity = self.spares.pop()
+            entity.__init__(*args)
+            return entity
+        return cls(*args)
+
+# Seaweed spatial index
+class SeaweedIndex:
+    """Uniform grid over seaweed centers plus the fish claiming each seaweed.
+
+    Claims are the fish currently targeting each seaweed, so targeting no
+    longer rescans fish_list. Removing a seaweed drops its claimants'
+    targets, so a pooled seaweed comes back unclaimed. Ties resolve by
+    seaweed id, the creation order the old linear scans over seaweed_list
+    followed.
+    """
+
+    CLAIM_COST = 30  # Cost per fish already heading for a seaweed
+    DISTANCE_COST = 0.7  # Cost per pixel to a seaweed
+
+    def __init__(self, cell_size=SEAWEED_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.claims = {}
+        self.claim_levels = [0]  # Seaweed count by number of claimants
+        self.bounds = None
+
+    def cell_of(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def add(self, seaweed):
+        key = self.cell_of(seaweed.rect.centerx, seaweed.rect.centery)
+        self.cells.setdefault(key, {})[seaweed] = None
+        self.claim_levels[0] += 1
+        self.bounds = None
+
+    def remove(self, seaweed):
+        key = self.cell_of(seaweed.rect.centerx, seaweed.rect.centery)
+        cell = self.cells.get(key)
+        if cell is not None:
+            cell.pop(seaweed, None)
+            if not cell:
+                del self.cells[key]
+                self.bounds = None
+        claimants = self.claims.pop(seaweed, ())
+        self.claim_levels[len(claimants)] -= 1
+        for fish in claimants:
+            fish.target_seaweed = None
+
+    def retarget(self, fish, seaweed):
+        """Point fish at seaweed (or None), keeping claim counts current"""
+        old = fish.target_seaweed
+        if old is seaweed:
+            return
+        levels = self.claim_levels
+        if old is not None:
+            claimants = self.claims[old]
+            levels[len(claimants)] -= 1
+            levels[len(claimants) - 1] += 1
+            del claimants[fish]
+            if not claimants:
+                del self.claims[old]
+        if seaweed is not None:
+            claimants = self.claims.setdefault(seaweed, {})
+            if len(levels) == len(claimants) + 1:
+                levels.append(0)
+            levels[len(claimants)] -= 1
+            levels[len(claimants) + 1] += 1
+            claimants[fish] = None
+        fish.target_seaweed = seaweed
+
+    def least_claims(self):
+        """The fewest claimants any indexed seaweed has"""
+        for count, seaweed in enumerate(self.claim_levels):
+            if seaweed:
+                return count
+        return 0
+
+    def get_bounds(self):
+        if self.bounds is None and self.cells:
+            xs = [key[0] for key in self.cells]
+            ys = [key[1] for key in self.cells]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        return self.bounds
+
+    def nearest(self, x, y):
+        """Seaweed minimising distance * 0.7 + claims * 30 from (x, y)"""
+        if not self.cells:
+            return None
+        claims = self.claims
+        # No seaweed in ring r or beyond can cost less than this plus
+        # (r - 1) cell widths of distance
+        floor = self.least_claims() * self.CLAIM_COST
+        step = self.cell_size * self.DISTANCE_COST
+        best = None
+        best_key = None
+        for ring, cell in self.cells_by_ring(*self.cell_of(x, y)):
+            if best_key is not None and best_key[0] < (ring - 1) * step + floor:
+                break
+            for seaweed in cell:
+                cost = (((seaweed.rect.centerx - x)**2 +
+                         (seaweed.rect.centery - y)**2)**0.5 * self.DISTANCE_COST +
+                        (len(claims.get(seaweed, ())) * self.CLAIM_COST))
+                if best_key is None or (cost, seaweed.id) < best_key:
+                    best = seaweed
+                    best_key = (cost, seaweed.id)
+        return best
+
+    def cells_by_ring(self, cx, cy):
+        """(ring, cell) for every occupied cell, in order of ring around (cx, cy)"""
+        cells = self.cells
+        ring = 0
+        while (2 * ring + 1) ** 2 <= len(cells):
+            for key in self.ring_cells(cx, cy, ring):
+                cell = cells.get(key)
+                if cell:
+                    yield ring, cell
+            ring += 1
+        # Fewer occupied cells left than cells in the next ring: sort those instead
+        rest = sorted((max(abs(gx - cx), abs(gy - cy)), gx, gy) for gx, gy in cells)
+        for distance, gx, gy in rest:
+            if distance >= ring:
+                yield distance, cells[(gx, gy)]
+
+    def ring_cells(self, cx, cy, ring):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for gx in range(cx - ring, cx + ring + 1):
+            yield (gx, cy - ring)
+            yield (gx, cy + ring)
+        for gy in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, gy)
+            yield (cx + ring, gy)
+
+    def colliding(self, rect):
+        """First seaweed (by id) whose rect overlaps rect, or None"""
+        # Seaweed are indexed by center, so pad the query by their size
+        x0, y0 = self.cell_of(rect.left - 10, rect.top - 20)
+        x1, y1 = self.cell_of(rect.right + 10, rect.bottom + 20)
+        found = None
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                cell = self.cells.get((gx, gy))
+                if not cell:
+                    continue
+                for seaweed in cell:
+                    if (found is None or seaweed.id < found.id) and rect.colliderect(seaweed.rect):
+                        found = seaweed
+        return found
+
+
+# Fish broad phase
+class FishGrid:
+    """Uniform grid over fish centers for picking and neighbour queries.
+
+    The game rebuilds it on demand, at most once per tick, after fish have
+    moved, arrived or left. Fish keep the order they were given in inside
+    each cell, so pick() finds the same fish as a front-to-back scan of
+    that list. Queries visit only the cells in reach, which keeps
+    bounded-radius fish-to-fish work linear in the number of fish.
+    """
+
+    def __init__(self, cell_size=FISH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}
+        self.reach = 0  # How far any fish's rect extends from its center
+        self.stale = True
+
+    def cell_of(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def invalidate(self):
+        self.stale = True
+
+    def rebuild(self, fish_list):
+        cells = {}
+        order = {}
+        reach = 0
+        size = self.cell_size
+        for i, fish in enumerate(fish_list):
+            rect = fish.rect
+            x, y = rect.center
+            cells.setdefault((x // size, y // size), []).append((fish, x, y))
+            order[fish] = i
+            reach = max(reach, rect.width, rect.height)
+        self.cells = cells
+        self.order = order
+        self.reach = reach // 2 + 1
+        self.stale = False
+
+    def cells_around(self, x, y, reach):
+        x0, y0 = self.cell_of(x - reach, y - reach)
+        x1, y1 = self.cell_of(x + reach, y + reach)
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                cell = self.cells.get((gx, gy))
+                if cell:
+                    yield cell
+
+    def pick(self, x, y):
+        """The first fish in rebuild order whose rect contains (x, y), or None"""
+        order = self.order
+        found = None
+        for cell in self.cells_around(x, y, self.reach):
+            for fish, fx, fy in cell:
+                if (found is None or order[fish] < order[found]) and fish.rect.collidepoint(x, y):
+                    found = fish
+        return found
+
+    def near(self, x, y, radius):
+        """Fish whose centers lie within radius of (x, y)"""
+        limit = radius * radius
+        return [fish for cell in self.cells_around(x, y, radius) for fish, fx, fy in cell
+                if (fx - x) ** 2 + (fy - y) ** 2 <= limit]
+
+    def pairs(self, radius):
+        """(a, b, dx, dy) once for every two fish with centers within radius,
+        where (dx, dy) runs from a's center to b's"""
+        limit = radius * radius
+        rings = int(math.ceil(radius / self.cell_size))
+        # Only the forward half of each neighbourhood, so every pair of cells meets once
+        offsets = [(dx, dy) for dx in range(rings + 1) for dy in range(-rings, rings + 1) if dx > 0 or dy > 0]
+        cells = self.cells
+        for (cx, cy), cell in cells.items():
+            forward = [entry for dx, dy in offsets for entry in cells.get((cx + dx, cy + dy), ())]
+            for i, (a, ax, ay) in enumerate(cell):
+                for others in (cell[i + 1:], forward):
+                    for b, bx, by in others:
+                        dx = bx - ax
+                        dy = by - ay
+                        if dx * dx + dy * dy <= limit:
+                            yield a, b, dx, dy
+
+# Population statistics
+class PopulationStats:
+    """Running counts of the tank population, kept current by the game.
+
+    The game reports every fish that joins (buy, birth) or leaves (sale,
+    death) and fish report their own growth, so the HUD and the economy
+    tick read totals without walking fish_list.
+    """
+
+    BASE_INCOME = 0.02  # Coins per second from a stage 1 fish
+
+    def __init__(self, max_stage=5):
+        self.max_stage = max_stage
+        self.total = 0
+        self.by_stage = [0] * (max_stage + 1)  # Index 0 unused
+        self.by_gender = {"male": 0, "female": 0}
+        self.by_type = {}
+        # Stage 5 fish per gender, the only ones allowed to breed
+        self.adults = {"male": 0, "female": 0}
+        self.stage_income = [self.BASE_INCOME * (1 + (stage - 1) * (stage / 2))
+                             for stage in range(max_stage + 1)]
+        self.income = 0.0
+        self.income_stale = False
+
+    def add(self, fish):
+        self.count(fish, fish.stage, 1)
+
+    def remove(self, fish):
+        self.count(fish, fish.stage, -1)
+
+    def grew(self, fish, old_stage):
+        """Move a fish from old_stage to its current stage"""
+        self.by_stage[old_stage] -= 1
+        self.by_stage[fish.stage] += 1
+        if old_stage == self.max_stage:
+            self.adults[fish.gender] -= 1
+        if fish.stage == self.max_stage:
+            self.adults[fish.gender] += 1
+        self.income_stale = True
+
+    def count(self, fish, stage, delta):
+        self.total += delta
+        self.by_stage[stage] += delta
+        self.by_gender[fish.gender] += delta
+        self.by_type[fish.type] = self.by_type.get(fish.type, 0) + delta
+        if stage == self.max_stage:
+            self.adults[fish.gender] += delta
+        self.income_stale = True
+
+    @property
+    def income_rate(self):
+        # Summed from the stage counts rather than adjusted in place, so
+        # float error never builds up over a long session
+        if self.income_stale:
+            self.income = sum(count * income for count, income in zip(self.by_stage, self.stage_income))
+            self.income_stale = False
+        return self.income
+
+    def rebuild(self, fish_list):
+        """Recount from scratch, grouping fish by (type, stage, gender)"""
+        self.clear()
+        groups = collections.Counter(map(operator.attrgetter("type", "stage", "gender"), fish_list))
+        for (fish_type, stage, gender), count in groups.items():
+            self.total += count
+            self.by_stage[stage] += count
+            self.by_gender[gender] += count
+            self.by_type[fish_type] = self.by_type.get(fish_type, 0) + count
+            if stage == self.max_stage:
+                self.adults[gender] += count
+        self.income_stale = True
+
+    @property
+    def breedable_adults(self):
+        """Adults that could currently be paired, two per pair"""
+        return 2 * min(self.adults["male"], self.adults["female"])
+
+    def clear(self):
+        self.__init__(self.max_stage)
@@ -0,0 +1,389 @@
+"""Binary columnar snapshots of a game, with background writing."""
+import array
+import operator
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # Only the numpy fish backend needs it
+    np = None
+
+from .logs import log
+from .assets import frame_cache
+from .sim import Fish, SPECIES, Seaweed, SimClock, hunger_rate
+from .population import FishView
+from .game import AquariumGame
+
+
+# Snapshots
+SNAPSHOT_MAGIC = b"AQSN"
+SNAPSHOT_VERSION = 2  # 2 added the seaweed reserved column; version 1 still loads
+SNAPSHOT_COMPRESSED = 1  # Flag bit: payload is zlib-compressed
+
+# Per-fish state saved column by column: (attribute, array typecode).
+# These are attributes on both Fish and FishView, so the object backend
+# reads them one attribute per column and the numpy backend copies its
+# own arrays of the same name.
+FISH_STATE = (
+    ("stage", "q"), ("food_eaten", "q"), ("hunger", "d"),
+    ("breed_timer", "d"), ("is_fertilized", "B"), ("last_breed_time", "d"),
+    ("last_eat_time", "d"), ("collision_start_time", "d"),
+    ("speed_x", "d"), ("speed_y", "d"), ("current_angle", "d"),
+    ("animation_frame", "q"), ("animation_timer", "d"), ("current_row", "q"),
+    ("is_hungry", "B"), ("pause_timer", "d"), ("swim_duration", "d"),
+    ("pause_duration", "d"), ("current_speed", "d"), ("movement_timer", "d"),
+    ("speed_variation", "d"),
+)
+# Columns derived from objects rather than plain attributes
+FISH_EXTRA = (
+    ("id", "q"), ("type", "B"), ("is_female", "B"),
+    ("left", "q"), ("top", "q"), ("width", "q"), ("height", "q"),
+    ("base_row", "B"), ("base_col", "B"), ("partner", "q"), ("target", "q"),
+)
+SEAWEED_COLUMNS = (("id", "q"), ("left", "q"), ("top", "q"), ("reserved", "B"))
+NUMPY_DTYPES = {"q": "<i8", "d": "<f8", "B": "u1"}
+
+# Game scalars: saved_at (wall clock), sim time, coins, time scale, next
+# fish id, next seaweed id, fish sold, selected fish ids, fish count,
+# seaweed count, auto feed, hunger bars, paused, breeding, sell mode
+SNAPSHOT_HEADER = struct.Struct("<4sHH")
+SNAPSHOT_GAME = struct.Struct("<ddddqqqqqqq5BH")
+
+
+def little_endian(column):
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+# What a snapshot reads from one Fish object: FISH_STATE, then these
+FISH_FIELDS = ("id", "gender", "rect.x", "rect.y", "rect.width", "rect.height", "animation_frames", "base_image")
+FISH_ROW = operator.attrgetter(*(name for name, _ in FISH_STATE), *FISH_FIELDS)
+SEAWEED_ROW = operator.attrgetter("id", "rect.x", "rect.y", "reserved")
+# Numpy columns a snapshot copies besides FISH_STATE
+POPULATION_EXTRA = ("id", "is_female", "left", "top", "width", "height", "base_row", "base_col")
+
+
+def capture_snapshot(game):
+    """Copy what a snapshot needs out of the tank, for capture_chunks.
+
+    This is the only part of saving that has to run on the game thread.
+    Numpy columns are copied whole and Fish objects are read into one
+    tuple each, so nothing captured changes when the game moves on.
+    """
+    fish_list = game.fish_list
+    types = sorted(game.population_stats.by_type) or ["Guppy"]
+    type_table = "\0".join(types).encode()
+    selected = [fish.id if fish is not None else -1 for fish in (game.selected_fish_1, game.selected_fish_2)]
+    header = SNAPSHOT_GAME.pack(
+        time.time(), game.sim_clock.now, game.coins, game.time_scale,
+        Fish._id_counter, Seaweed._id_counter, getattr(game, "fish_sold", 0),
+        selected[0], selected[1], len(fish_list), len(game.seaweed_list),
+        game.auto_feed, game.show_hunger_bar, game.is_paused, bool(game.breeding_in_progress),
+        game.is_selling_mode, len(type_table),
+    )
+    capture = {
+        "header": header,
+        "types": types,
+        "type": list(map(operator.attrgetter("type"), fish_list)),
+        "seaweed": list(map(SEAWEED_ROW, game.seaweed_list)),
+    }
+
+    pop = game.population
+    if pop is not None:
+        capture["columns"] = {name: pop.column(name).copy()
+                              for name in [name for name, _ in FISH_STATE] + list(POPULATION_EXTRA)}
+        # Only courting and targeting rows hold a link to look up
+        for name, mask, attribute in (("partner", "has_partner", "breeding_partner"),
+                                      ("target", "has_target", "target_seaweed")):
+            links = np.full(pop.size, -1, np.int64)
+            rows = np.flatnonzero(pop.column(mask))
+            links[rows] = [getattr(pop.views[row], attribute).id for row in rows.tolist()]
+            capture[name] = links
+    else:
+        capture["rows"] = list(map(FISH_ROW, fish_list))
+        capture["partner"] = [partner.id if partner is not None else -1
+                              for partner in map(operator.attrgetter("breeding_partner"), fish_list)]
+        capture["target"] = [seaweed.id if seaweed is not None else -1
+                             for seaweed in map(operator.attrgetter("target_seaweed"), fish_list)]
+    return capture
+
+
+def capture_chunks(capture):
+    """Pack a capture_snapshot as a list of byte strings, header first"""
+    types = capture["types"]
+    type_index = {name: i for i, name in enumerate(types)}
+    chunks = [capture["header"], "\0".join(types).encode()]
+
+    extra = {
+        "type": [type_index[fish_type] for fish_type in capture["type"]],
+        "partner": capture["partner"],
+        "target": capture["target"],
+    }
+    columns = capture.get("columns")
+    if columns is not None:
+        for name, code in FISH_STATE:
+            chunks.append(columns[name].astype(NUMPY_DTYPES[code]).tobytes())
+        for name in POPULATION_EXTRA:
+            extra[name] = columns[name]
+    else:
+        fields = list(zip(*capture["rows"])) or [()] * (len(FISH_STATE) + len(FISH_FIELDS))
+        for (name, code), column in zip(FISH_STATE, fields):
+            chunks.append(little_endian(array.array(code, column)))
+        fish_fields = dict(zip(FISH_FIELDS, fields[len(FISH_STATE):]))
+        extra["id"] = fish_fields["id"]
+        extra["is_female"] = [gender == "female" for gender in fish_fields["gender"]]
+        extra["left"], extra["top"] = fish_fields["rect.x"], fish_fields["rect.y"]
+        extra["width"], extra["height"] = fish_fields["rect.width"], fish_fields["rect.height"]
+        extra["base_row"], extra["base_col"] = [], []
+        for frames, base_image in zip(fish_fields["animation_frames"], fish_fields["base_image"]):
+            row, col = base_frame_index(frames, base_image)
+            extra["base_row"].append(row)
+            extra["base_col"].append(col)
+    for name, code in FISH_EXTRA:
+        column = extra[name]
+        if columns is not None and name != "type":
+            chunks.append(column.astype(NUMPY_DTYPES[code]).tobytes())
+        else:
+            chunks.append(little_endian(array.array(code, column)))
+
+    seaweed = list(zip(*capture["seaweed"])) or [()] * len(SEAWEED_COLUMNS)
+    for (name, code), column in zip(SEAWEED_COLUMNS, seaweed):
+        chunks.append(little_endian(array.array(code, column)))
+    return chunks
+
+
+def snapshot_chunks(game):
+    """Capture the tank and pack it at once; see capture_snapshot"""
+    return capture_chunks(capture_snapshot(game))
+
+
+def base_frame_index(frames, base_image):
+    """(row, col) of base_image in a 3x3 frame grid"""
+    for row, row_frames in enumerate(frames or ()):
+        for col, frame in enumerate(row_frames):
+            if frame is base_image:
+                return row, col
+    return 1, 0
+
+
+def encode_snapshot(chunks, compress=True):
+    payload = b"".join(chunks)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 1)
+        flags |= SNAPSHOT_COMPRESSED
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags) + payload
+
+
+def write_snapshot(path, chunks, compress=True):
+    """Write atomically, so a crash mid-save leaves the previous file intact"""
+    data = encode_snapshot(chunks, compress)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def save_snapshot(game, path, compress=True):
+    write_snapshot(path, snapshot_chunks(game), compress)
+
+
+def read_columns(payload, offset, count, spec):
+    """Slice count-long columns out of payload; returns ({name: array}, end)"""
+    columns = {}
+    for name, code in spec:
+        size = count * array.array(code).itemsize
+        column = array.array(code)
+        column.frombytes(payload[offset:offset + size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns[name] = column
+        offset += size
+    return columns, offset
+
+
+def load_snapshot(path, headless=False, backend="objects"):
+    """Build an AquariumGame from a snapshot file.
+
+    Fish are rebuilt straight from the columns without running
+    Fish.__init__, so no random draws, logging or per-fish asset work;
+    frames come from the shared frame cache. Returns (game, saved_at).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, flags = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not an aquarium snapshot")
+    if version not in (1, SNAPSHOT_VERSION):
+        raise ValueError(f"Unsupported snapshot version {version} in {path}")
+    payload = memoryview(data)[SNAPSHOT_HEADER.size:]
+    if flags & SNAPSHOT_COMPRESSED:
+        payload = memoryview(zlib.decompress(payload))
+
+    (saved_at, now, coins, time_scale, next_fish_id, next_seaweed_id, fish_sold,
+     selected_1, selected_2, fish_count, seaweed_count, auto_feed, show_hunger_bar,
+     is_paused, breeding_in_progress, is_selling_mode, type_table_size) = SNAPSHOT_GAME.unpack_from(payload)
+    offset = SNAPSHOT_GAME.size
+    types = bytes(payload[offset:offset + type_table_size]).decode().split("\0")
+    offset += type_table_size
+    state, offset = read_columns(payload, offset, fish_count, FISH_STATE)
+    extra, offset = read_columns(payload, offset, fish_count, FISH_EXTRA)
+    seaweed_spec = SEAWEED_COLUMNS if version >= 2 else SEAWEED_COLUMNS[:3]
+    seaweed_columns, offset = read_columns(payload, offset, seaweed_count, seaweed_spec)
+
+    game = AquariumGame(headless=headless, sim_clock=SimClock(now), backend=backend)
+    game.coins = coins
+    game.time_scale = time_scale
+    game.fish_sold = fish_sold
+    game.auto_feed = bool(auto_feed)
+    game.show_hunger_bar = bool(show_hunger_bar)
+    game.is_paused = bool(is_paused)
+    game.is_selling_mode = bool(is_selling_mode)
+
+    reserved = seaweed_columns.get("reserved", [0] * seaweed_count)
+    for seaweed_id, left, top, is_reserved in zip(
+            seaweed_columns["id"], seaweed_columns["left"], seaweed_columns["top"], reserved):
+        seaweed = Seaweed(left, top, bool(is_reserved))
+        seaweed.id = seaweed_id
+        game.add_seaweed(seaweed)
+
+    if game.population is not None:
+        fish_list = restore_population(game, state, extra, types)
+    else:
+        fish_list = restore_fish(game, state, extra, types)
+    for fish in fish_list:
+        game.fish_list.add(fish)
+    game.population_stats.rebuild(fish_list)
+    if game.population is None:
+        for fish in fish_list:
+            game.timers.add(fish)
+
+    for fish, partner, target in zip(fish_list, extra["partner"], extra["target"]):
+        if partner >= 0:
+            fish.breeding_partner = game.fish_list.get(partner)
+        if target >= 0:
+            game.seaweed_index.retarget(fish, game.seaweed_list.get(target))
+    game.selected_fish_1 = game.fish_list.get(selected_1)
+    game.selected_fish_2 = game.fish_list.get(selected_2)
+    game.breeding_in_progress = bool(breeding_in_progress)
+    for fish in fish_list:
+        if fish.breeding_partner:
+            game.timers.schedule_mate(fish)
+    Fish._id_counter = next_fish_id
+    Seaweed._id_counter = next_seaweed_id
+    return game, saved_at
+
+
+def restore_fish(game, state, extra, types):
+    """Fish objects from snapshot columns, bypassing __init__"""
+    names = [name for name, code in FISH_STATE]
+    stage_column = names.index("stage")
+    columns = [list(map(bool, state[name])) if code == "B" else state[name] for name, code in FISH_STATE]
+    fish_list = []
+    for row, fish_id, type_index, is_female, left, top, width, height, base_row, base_col in zip(
+            zip(*columns), extra["id"], extra["type"], extra["is_female"], extra["left"],
+            extra["top"], extra["width"], extra["height"], extra["base_row"], extra["base_col"]):
+        fish = Fish.__new__(Fish)
+        fish.id = fish_id
+        fish.game = game
+        fish.type = types[type_index]
+        fish.species = SPECIES[fish.type]
+        fish.stage = row[stage_column]
+        fish.hunger_per_second = hunger_rate(fish.stage)
+        for name, value in zip(names, row):
+            setattr(fish, name, value)
+        fish.gender = "female" if is_female else "male"
+        fish.breeding_partner = None
+        fish.target_seaweed = None
+        fish.load_animation_frames(fish.sprite_folder(growing=fish.stage > 1))
+        fish.rect = pygame.Rect(left, top, width, height)
+        if fish.animation_frames:
+            fish.base_image = fish.animation_frames[base_row][base_col]
+            flipped = fish.speed_x < 0
+            fish.image = frame_cache.pose(fish.base_image, flipped, -fish.current_angle if flipped else fish.current_angle)
+        else:
+            fish.base_image = None
+            fish.image = None
+        fish_list.append(fish)
+    return fish_list
+
+
+def restore_population(game, state, extra, types):
+    """Bulk-copy snapshot columns into the numpy population"""
+    pop = game.population
+    count = len(extra["id"])
+    for name, column in pop.cols.items():
+        if len(column) < count:
+            pop.cols[name] = np.zeros(max(count, 2 * len(column)), column.dtype)
+    pop.size = count
+    cols = pop.cols
+    for name, code in FISH_STATE + FISH_EXTRA:
+        if name in cols:
+            source = state if name in state else extra
+            cols[name][:count] = np.frombuffer(source[name], NUMPY_DTYPES[code])
+    fish_list = []
+    for slot, (fish_id, type_index) in enumerate(zip(extra["id"], extra["type"])):
+        fish = FishView(pop, slot, game, types[type_index])
+        fish.id = fish_id
+        fish_list.append(fish)
+    pop.views = fish_list[:]
+
+    # One sprite lookup per (type, stage, gender) rather than per fish
+    type_column = np.frombuffer(extra["type"], NUMPY_DTYPES["B"])
+    keys = np.stack([type_column, pop.column("stage"), pop.column("is_female")], axis=1)
+    combos, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    sprites = np.array([pop.sprite_id(fish_list[i].sprite_folder(growing=fish_list[i].stage > 1),
+                                      fish_list[i].size_multiplier) for i in first], dtype=cols["sprite"].dtype)
+    cols["sprite"][:count] = sprites[inverse.ravel()]
+    return fish_list
+
+
+class SnapshotWriter:
+    """Packs, compresses and writes snapshots on a background thread.
+
+    submit() only queues a capture_snapshot(), so autosave costs the frame
+    nothing beyond copying the tank. If the disk falls behind, a queued
+    snapshot that hasn't started writing is replaced by the newer one.
+    """
+
+    def __init__(self, path, compress=True):
+        self.path = path
+        self.compress = compress
+        self.pending = queue.Queue(maxsize=1)
+        self.thread = threading.Thread(target=self.run, name="snapshot-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, capture):
+        while True:
+            try:
+                self.pending.put_nowait(capture)
+                return
+            except queue.Full:
+                try:
+                    self.pending.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def run(self):
+        while True:
+            capture = self.pending.get()
+            if capture is None:
+                return
+            try:
+                write_snapshot(self.path, capture_chunks(capture), self.compress)
+            except OSError:
+                log.exception("Autosave to %s failed", self.path)
+
+    def close(self):
+        """Finish any queued write and stop the thread"""
+        self.pending.put(None)
+        self.thread.join()
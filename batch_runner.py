@@ -0,0 +1,292 @@
+"""Seeded batch runs of many headless tanks for economy balancing.
+
+Sweeps shop prices, breed cooldown, food needed per stage and starting
+coins over a process pool, sampling every tank at fixed simulated
+intervals and streaming the samples into a columnar results file:
+
+    python batch_runner.py --sweep seaweed_price=2,3,4 --sweep coins=100,200 \\
+        --replicates 50 --sim-seconds 3600 --output sweep.aqbr
+
+Each run's seed depends only on --seed and the run index, so any single
+tank can be replayed on its own with --only RUN.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import array
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import struct
+import sys
+import time
+import zlib
+
+import aquarium as aq
+
+# name: (parse one sweep value, default)
+PARAMETERS = {
+    "coins": (float, 200.0),
+    "guppy_price": (float, 8.0),
+    "seaweed_price": (float, 3.0),
+    "breed_cooldown": (float, float(aq.SPECIES["Guppy"].breed_cooldown)),
+    # Slash-separated food per stage, e.g. 3/5/7/10/0
+    "food_needed": (lambda text: tuple(int(n) for n in text.split("/")), aq.SPECIES["Guppy"].food_needed),
+}
+
+# One row per sample: (column, array typecode)
+COLUMNS = (
+    ("run", "q"), ("combo", "q"), ("seed", "q"), ("t", "d"), ("coins", "d"),
+    ("fish", "q"), ("stage_1", "q"), ("stage_2", "q"), ("stage_3", "q"),
+    ("stage_4", "q"), ("stage_5", "q"), ("seaweed", "q"), ("starved", "q"),
+)
+
+BATCH_MAGIC = b"AQBR"
+BATCH_VERSION = 1
+BATCH_HEADER = struct.Struct("<4sHI")  # magic, version, metadata length
+GROUP_HEADER = struct.Struct("<I")  # rows in the row group
+
+
+def parse_sweeps(specs):
+    """Cartesian product of --sweep name=v1,v2 options as parameter dicts"""
+    values = {name: [default] for name, (parse, default) in PARAMETERS.items()}
+    for spec in specs:
+        name, _, options = spec.partition("=")
+        if name not in PARAMETERS:
+            raise SystemExit(f"Unknown sweep parameter {name!r}; choose from {', '.join(PARAMETERS)}")
+        values[name] = [PARAMETERS[name][0](option) for option in options.split(",")]
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*values.values())]
+
+
+def run_seed(base_seed, run):
+    """Seed for one run, independent of worker count and scheduling"""
+    digest = hashlib.blake2b(f"{base_seed}:{run}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> 1
+
+
+def apply_params(game, params):
+    game.coins = params["coins"]
+    game.shop_items["Guppy"] = params["guppy_price"]
+    game.shop_items["Seaweed"] = params["seaweed_price"]
+    # Fish tuning lives in the shared species table; a worker runs one tank at a time
+    for species in aq.SPECIES.values():
+        species.breed_cooldown = params["breed_cooldown"]
+        species.food_needed = params["food_needed"]
+
+
+def pair_adults(game):
+    """Start a courtship between the first ready female and male, like a player would"""
+    if game.breeding_in_progress:
+        return
+    now = game.sim_clock.now
+    ready = {"female": None, "male": None}
+    for fish in game.fish_list:
+        if (fish.stage == fish.max_stage and ready[fish.gender] is None and not fish.is_fertilized and
+                now - fish.last_breed_time >= fish.breed_cooldown):
+            ready[fish.gender] = fish
+    if ready["female"] and ready["male"]:
+        game.selected_fish_1, game.selected_fish_2 = ready["female"], ready["male"]
+        game.start_breeding(ready["female"], ready["male"])
+
+
+def sample(game, run, combo, seed):
+    stats = game.population_stats
+    return (run, combo, seed, game.sim_clock.now, game.coins, stats.total,
+            *stats.by_stage[1:6], len(game.seaweed_list), game.starved)
+
+
+def run_tank(task):
+    """Simulate one seeded tank and return its samples as a list of rows"""
+    run, combo, params, options = task
+    seed = run_seed(options["seed"], run)
+    aq.Fish._id_counter = 0
+    aq.Seaweed._id_counter = 0
+    game = aq.AquariumGame(headless=True, backend=options["backend"], seed=seed)
+    game.time_scale = options["time_scale"]
+    apply_params(game, params)
+    for _ in range(options["stock"]):
+        game.buy_fish("Guppy")
+    game.auto_feed = True
+
+    rows = [sample(game, run, combo, seed)]
+    interval = options["sample_interval"]
+    while game.sim_clock.now < options["sim_seconds"] and game.fish_list:
+        game.run_for(min(interval, options["sim_seconds"] - game.sim_clock.now))
+        if options["breed"]:
+            pair_adults(game)
+        rows.append(sample(game, run, combo, seed))
+    return rows
+
+
+def init_worker():
+    aq.configure_logging(logging.WARNING, background=False, stream=sys.stderr)
+
+
+class ResultWriter:
+    """Streams sample rows into a columnar results file.
+
+    Rows are buffered and flushed as row groups: each column of a group is
+    packed with array and zlib-compressed on its own, so readers can pull
+    single columns without parsing rows and the writer never holds more
+    than one group in memory.
+    """
+
+    def __init__(self, path, metadata, group_rows=65536):
+        self.file = open(path, "wb")
+        self.group_rows = group_rows
+        self.columns = [array.array(code) for name, code in COLUMNS]
+        meta = json.dumps(dict(metadata, columns=COLUMNS)).encode()
+        self.file.write(BATCH_HEADER.pack(BATCH_MAGIC, BATCH_VERSION, len(meta)) + meta)
+
+    def write(self, rows):
+        for row in rows:
+            for column, value in zip(self.columns, row):
+                column.append(value)
+        if len(self.columns[0]) >= self.group_rows:
+            self.flush()
+
+    def flush(self):
+        rows = len(self.columns[0])
+        if not rows:
+            return
+        chunks = [GROUP_HEADER.pack(rows)]
+        for column in self.columns:
+            data = zlib.compress(aq.little_endian(column), 6)
+            chunks.append(GROUP_HEADER.pack(len(data)))
+            chunks.append(data)
+        self.file.write(b"".join(chunks))
+        self.columns = [array.array(code) for name, code in COLUMNS]
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def read_results(path, names=None):
+    """Load a results file as (metadata, {column: array}), optionally only some columns"""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, meta_size = BATCH_HEADER.unpack_from(data)
+    if magic != BATCH_MAGIC:
+        raise ValueError(f"{path} is not a batch results file")
+    if version != BATCH_VERSION:
+        raise ValueError(f"Unsupported batch results version {version} in {path}")
+    offset = BATCH_HEADER.size
+    metadata = json.loads(data[offset:offset + meta_size])
+    offset += meta_size
+    columns = {name: array.array(code) for name, code in metadata["columns"]
+               if names is None or name in names}
+    while offset < len(data):
+        offset += GROUP_HEADER.size  # Row count; the column sizes say the rest
+        for name, code in metadata["columns"]:
+            (size,) = GROUP_HEADER.unpack_from(data, offset)
+            offset += GROUP_HEADER.size
+            if name in columns:
+                column = array.array(code, zlib.decompress(data[offset:offset + size]))
+                if sys.byteorder == "big":
+                    column.byteswap()
+                columns[name].extend(column)
+            offset += size
+    return metadata, columns
+
+
+class Summary:
+    """Running per-combination totals of each tank's final sample"""
+
+    def __init__(self, combos):
+        self.combos = combos
+        self.totals = [{"runs": 0, "coins": 0.0, "fish": 0, "starved": 0, "extinct": 0} for _ in combos]
+
+    def add(self, rows):
+        final = dict(zip((name for name, code in COLUMNS), rows[-1]))
+        totals = self.totals[final["combo"]]
+        totals["runs"] += 1
+        totals["coins"] += final["coins"]
+        totals["fish"] += final["fish"]
+        totals["starved"] += final["starved"]
+        totals["extinct"] += final["fish"] == 0
+
+    def report(self):
+        report = []
+        for params, totals in zip(self.combos, self.totals):
+            runs = totals["runs"] or 1
+            report.append({
+                "params": params,
+                "runs": totals["runs"],
+                "mean_final_coins": totals["coins"] / runs,
+                "mean_final_fish": totals["fish"] / runs,
+                "mean_starved": totals["starved"] / runs,
+                "extinct_share": totals["extinct"] / runs,
+            })
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sweep", action="append", default=[], metavar="NAME=V1,V2",
+                        help="parameter values to sweep: " + ", ".join(PARAMETERS))
+    parser.add_argument("--replicates", type=int, default=10, help="seeded tanks per parameter combination")
+    parser.add_argument("--sim-seconds", type=float, default=3600.0)
+    parser.add_argument("--sample-interval", type=float, default=60.0, help="simulated seconds between samples")
+    parser.add_argument("--time-scale", type=float, default=6.0,
+                        help="simulated seconds per fixed step of wall time, as the speed buttons")
+    parser.add_argument("--stock", type=int, default=6, help="guppies bought with the starting coins")
+    parser.add_argument("--no-breed", dest="breed", action="store_false",
+                        help="never pair adults for breeding")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backend", choices=("objects", "numpy"), default="objects")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--only", type=int, metavar="RUN", help="run just this run index in-process")
+    parser.add_argument("--output", default="batch.aqbr", help="columnar results file")
+    args = parser.parse_args(argv)
+
+    combos = parse_sweeps(args.sweep)
+    if args.only is not None and not 0 <= args.only < len(combos) * args.replicates:
+        parser.error(f"--only must be a run index below {len(combos) * args.replicates}")
+    options = {
+        "seed": args.seed, "backend": args.backend, "time_scale": args.time_scale,
+        "stock": args.stock, "breed": args.breed,
+        "sim_seconds": args.sim_seconds, "sample_interval": args.sample_interval,
+    }
+    runs = range(len(combos) * args.replicates) if args.only is None else [args.only]
+    tasks = ((run, run // args.replicates, combos[run // args.replicates], options) for run in runs)
+    metadata = {"combos": combos, "replicates": args.replicates, "options": options}
+
+    writer = ResultWriter(args.output, metadata)
+    summary = Summary(combos)
+    start = time.perf_counter()
+    if args.only is not None or args.workers <= 1:
+        init_worker()
+        results = map(run_tank, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(args.workers, initializer=init_worker)
+        # Ordered, so the file is identical whatever the worker count
+        results = pool.imap(run_tank, tasks)
+    try:
+        for rows in results:
+            writer.write(rows)
+            summary.add(rows)
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    print(json.dumps({
+        "runs": len(runs),
+        "workers": 1 if pool is None else args.workers,
+        "elapsed_s": time.perf_counter() - start,
+        "output": args.output,
+        "combos": summary.report(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
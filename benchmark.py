@@ -0,0 +1,255 @@
+"""Seeded throughput benchmarks for the aquarium simulation and renderer.
+
+Runs without a real display (SDL dummy video driver) and prints one JSON
+document, so CI machines can track regressions:
+
+    python benchmark.py --fish 500 --seaweed 100 > bench.json
+
+Cold start is measured separately, in fresh interpreters, against
+STARTUP_TARGET_MS, and a 500 fish, 100 seaweed tank against the tick of
+the code before the seaweed index (TARGETING_BASELINE_MS).
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+import aquarium as aq
+
+SCENARIOS = {
+    "steady": {},
+    "breeding": {"breeding": True},
+    "auto_feed": {"auto_feed": True},
+    "sell_mode": {"sell_mode": True},
+    "mixed": {"breeding": True, "auto_feed": True, "sell_mode": True},
+    "avoidance": {"avoidance": True},
+}
+
+# Cold start budget: launching the interpreter to the first frame on screen
+STARTUP_TARGET_MS = 500
+
+# Mean update tick of the pre-index code with 500 fish and 100 seaweed,
+# and that only while no fish is hungry; hungry fish made it far slower
+TARGETING_BASELINE_MS = 16
+TARGETING_TANK = (500, 100)
+STARTUP_PROBE = """
+import json, time
+start = time.perf_counter()
+import aquarium
+imported = time.perf_counter()
+game = aquarium.AquariumGame(seed=1)
+created = time.perf_counter()
+import pygame
+pygame.display.update(game.draw(game.screen))
+drawn = time.perf_counter()
+print(json.dumps({
+    "import_ms": 1000 * (imported - start),
+    "game_ms": 1000 * (created - imported),
+    "first_frame_ms": 1000 * (drawn - created),
+    "frame_at": time.time(),
+}))
+"""
+
+
+def build_game(fish, seaweed, seed, backend="objects", breeding=False, auto_feed=False, sell_mode=False,
+               avoidance=False):
+    """A tank with fish spread over stages 1-5 and seaweed scattered around"""
+    rng = random.Random(seed)
+    game = aq.AquariumGame(backend=backend, seed=seed)
+    game.coins = 1_000_000
+    for i in range(fish):
+        x = rng.uniform(50, aq.SCREEN_WIDTH - 50)
+        y = rng.uniform(50, aq.SCREEN_HEIGHT - 50)
+        new_fish = game.create_fish(x, y, "Guppy", stage=i % 5 + 1)
+        new_fish.hunger = rng.uniform(0, 100)
+        game.add_fish(new_fish)
+    for _ in range(seaweed):
+        x = rng.uniform(20, aq.SCREEN_WIDTH - 30)
+        y = rng.uniform(20, aq.SCREEN_HEIGHT - 40)
+        game.add_seaweed(aq.Seaweed(x, y))
+
+    if breeding:
+        adults = [f for f in game.fish_list if f.stage == 5]
+        females = [f for f in adults if f.gender == "female"]
+        males = [f for f in adults if f.gender == "male"]
+        for f in adults:
+            f.last_breed_time = -f.breed_cooldown
+        if females and males:
+            game.selected_fish_1, game.selected_fish_2 = females[0], males[0]
+            game.start_breeding(females[0], males[0])
+        # A share of the other females are already carrying babies
+        for f in females[1::4]:
+            f.is_fertilized = True
+            f.breed_timer = rng.uniform(0, f.breed_delay)
+
+    game.auto_feed = auto_feed
+    game.is_selling_mode = sell_mode
+    game.fish_avoidance = avoidance
+    return game
+
+
+def timings(samples):
+    samples = sorted(samples)
+    return {
+        "mean_ms": 1000 * sum(samples) / len(samples),
+        "p95_ms": 1000 * samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": 1000 * samples[-1],
+    }
+
+
+def run_scenario(name, args):
+    options = SCENARIOS[name]
+    game = build_game(args.fish, args.seaweed, args.seed, args.backend, **options)
+    clock = time.perf_counter
+
+    update_samples = []
+    start = clock()
+    for _ in range(args.ticks):
+        t0 = clock()
+        game.update(aq.FIXED_DT)
+        update_samples.append(clock() - t0)
+    update_total = clock() - start
+
+    draw = game.draw_dirty if args.renderer == "dirty" else game.draw
+    draw_samples = []
+    flip_samples = []
+    dirty_area = 0
+    for _ in range(args.frames):
+        # Keep the tank moving so the dirty renderer has real work to do
+        game.update(aq.FIXED_DT)
+        t0 = clock()
+        rects = draw(game.screen)
+        t1 = clock()
+        pygame.display.update(rects)
+        draw_samples.append(t1 - t0)
+        flip_samples.append(clock() - t1)
+        dirty_area += sum(rect.width * rect.height for rect in rects)
+    render_total = sum(draw_samples) + sum(flip_samples)
+
+    # A shorter profiled pass splits update and draw into their phases
+    profiler = game.profiler
+    profiler.enabled = True
+    breakdown = {}
+    profiled_frames = max(1, min(args.frames, 120))
+    for _ in range(profiled_frames):
+        game.update(aq.FIXED_DT)
+        draw(game.screen)
+        profiler.end_frame()
+        for phase, seconds in profiler.last_phases.items():
+            breakdown[phase] = breakdown.get(phase, 0.0) + seconds
+    profiler.enabled = False
+
+    # Memory is measured on a fresh tank so tracing doesn't skew the timings
+    tracemalloc.start()
+    memory_game = build_game(args.fish, args.seaweed, args.seed, args.backend, **options)
+    memory_game.step(min(args.ticks, 60))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "backend": args.backend,
+        "renderer": args.renderer,
+        "fish": args.fish,
+        "seaweed": args.seaweed,
+        "seed": args.seed,
+        "ticks": args.ticks,
+        "frames": args.frames,
+        "ticks_per_sec": args.ticks / update_total if update_total else None,
+        "frames_per_sec": args.frames / render_total if render_total else None,
+        "phases": {
+            "update": timings(update_samples),
+            "draw": timings(draw_samples),
+            "flip": timings(flip_samples),
+        },
+        "dirty_screen_fraction": dirty_area / (args.frames * aq.SCREEN_WIDTH * aq.SCREEN_HEIGHT) if args.frames else None,
+        "phase_breakdown_ms": {phase: 1000 * seconds / profiled_frames
+                               for phase, seconds in sorted(breakdown.items())},
+        "peak_traced_bytes": peak,
+        "final_fish": len(game.fish_list),
+        "final_seaweed": len(game.seaweed_list),
+    }
+
+
+def run_startup(runs):
+    """Median cold-start phases over runs fresh interpreters"""
+    samples = []
+    for _ in range(runs):
+        launched = time.time()
+        result = subprocess.run([sys.executable, "-c", STARTUP_PROBE], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        sample = json.loads(result.stdout.splitlines()[-1])
+        sample["to_first_frame_ms"] = 1000 * (sample.pop("frame_at") - launched)
+        samples.append(sample)
+    medians = {name: statistics.median(sample[name] for sample in samples) for name in samples[0]}
+    return dict(medians, runs=runs, target_ms=STARTUP_TARGET_MS,
+                within_target=medians["to_first_frame_ms"] <= STARTUP_TARGET_MS)
+
+
+def run_targeting(ticks, seed):
+    """Mean tick of the TARGETING_TANK, with most fish hungry, against TARGETING_BASELINE_MS"""
+    fish, seaweed = TARGETING_TANK
+    game = build_game(fish, seaweed, seed)
+    samples = []
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        game.update(aq.FIXED_DT)
+        samples.append(time.perf_counter() - t0)
+    result = timings(samples)
+    return dict(result, fish=fish, seaweed=seaweed, ticks=ticks, baseline_ms=TARGETING_BASELINE_MS,
+                beats_baseline=result["mean_ms"] < TARGETING_BASELINE_MS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS) + ["all"], default="all")
+    parser.add_argument("--fish", type=int, default=300)
+    parser.add_argument("--seaweed", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=600, help="simulation ticks to time")
+    parser.add_argument("--frames", type=int, default=300, help="rendered frames to time")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backend", choices=("objects", "numpy"), default="objects")
+    parser.add_argument("--renderer", choices=("full", "dirty"), default="full",
+                        help="full-screen redraw or the dirty-rect renderer")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="fresh interpreters to time cold start in (0 to skip)")
+    parser.add_argument("--targeting-ticks", type=int, default=300,
+                        help="ticks to time the targeting tank for (0 to skip)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    aq.configure_logging(logging.WARNING, background=False, stream=sys.stderr)
+    names = sorted(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        "startup": run_startup(args.startup_runs) if args.startup_runs > 0 else None,
+        "targeting": run_targeting(args.targeting_ticks, args.seed) if args.targeting_ticks > 0 else None,
+        "results": [run_scenario(name, args) for name in names],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+
+import aquarium as aq
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    aq.configure_logging("WARNING", background=False)
+    yield
+    aq.stop_logging()
+
+
+@pytest.fixture
+def make_tank():
+    """Build a seeded headless tank with fish spread over stages 1-5"""
+    def make(backend="objects", fish=30, seaweed=0, seed=3, coins=500, auto_feed=False, time_scale=3):
+        aq.Fish._id_counter = 0
+        aq.Seaweed._id_counter = 0
+        rng = random.Random(seed)
+        game = aq.AquariumGame(headless=True, backend=backend, seed=seed)
+        for i in range(fish):
+            new_fish = game.create_fish(rng.uniform(50, aq.SCREEN_WIDTH - 50),
+                                        rng.uniform(50, aq.SCREEN_HEIGHT - 50), "Guppy", stage=i % 5 + 1)
+            new_fish.hunger = rng.uniform(0, 60)
+            game.add_fish(new_fish)
+        for _ in range(seaweed):
+            game.add_seaweed(aq.Seaweed(rng.uniform(20, aq.SCREEN_WIDTH - 30), rng.uniform(20, aq.SCREEN_HEIGHT - 40)))
+        game.coins = coins
+        game.auto_feed = auto_feed
+        game.time_scale = time_scale
+        return game
+    return make
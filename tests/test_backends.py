@@ -0,0 +1,33 @@
+"""The numpy fish backend against the per-object one."""
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def test_hunger_income_and_starvation_match(make_tank):
+    # With no seaweed nothing depends on where the fish swim
+    objects = make_tank("objects", fish=20)
+    numpy = make_tank("numpy", fish=20)
+    objects.run_for(120)
+    numpy.run_for(120)
+
+    assert numpy.coins == pytest.approx(objects.coins, rel=1e-3)
+    assert numpy.starved == objects.starved
+    hunger = {fish.id: fish.hunger for fish in objects.fish_list}
+    assert {fish.id for fish in numpy.fish_list} == hunger.keys()
+    for fish in numpy.fish_list:
+        assert fish.hunger == pytest.approx(hunger[fish.id], abs=0.1)
+
+
+def test_auto_fed_tank_matches_within_tolerance(make_tank):
+    # Swimming draws different random numbers per backend, so only totals compare
+    objects = make_tank("objects", auto_feed=True)
+    numpy = make_tank("numpy", auto_feed=True)
+    objects.run_for(600)
+    numpy.run_for(600)
+
+    assert numpy.coins == pytest.approx(objects.coins, rel=0.03)
+    assert numpy.starved == objects.starved == 0
+    assert numpy.population_stats.by_stage == objects.population_stats.by_stage
+    assert max(fish.hunger for fish in numpy.fish_list) < 60
+    assert max(fish.hunger for fish in objects.fish_list) < 60
@@ -0,0 +1,26 @@
+"""Offline catch-up against 60 Hz play from the same snapshot."""
+import pytest
+
+import aquarium as aq
+from aquarium import population
+
+BACKENDS = ["objects", pytest.param("numpy", marks=pytest.mark.skipif(
+    population.np is None, reason="numpy backend unavailable"))]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seaweed, auto_feed, seconds", [(5, True, 900), (0, False, 600)],
+                         ids=["auto_fed", "unfed"])
+def test_offline_catch_up_matches_stepped_play(tmp_path, make_tank, backend, seaweed, auto_feed, seconds):
+    game = make_tank(backend, fish=40, seaweed=seaweed, auto_feed=auto_feed)
+    path = str(tmp_path / "tank.snap")
+    aq.save_snapshot(game, path)
+    game.run_for(seconds)
+
+    resumed, _ = aq.load_snapshot(path, headless=True, backend=backend)
+    aq.OfflineProgress(resumed).run(seconds)
+    # The OfflineProgress docstring promises coins within 3% and exact counts
+    assert resumed.coins == pytest.approx(game.coins, rel=0.03)
+    assert resumed.population_stats.total == game.population_stats.total
+    assert resumed.starved == game.starved
+    assert resumed.sim_clock.now == pytest.approx(game.sim_clock.now, abs=0.05)
@@ -0,0 +1,171 @@
+"""Simulation data structures against brute-force versions of the same queries."""
+import random
+
+import pygame
+import pytest
+
+import aquarium as aq
+
+
+class Claimant:
+    """Just enough of a fish for SeaweedIndex.retarget"""
+
+    def __init__(self):
+        self.target_seaweed = None
+
+
+def nearest_by_scan(seaweed_list, claims, x, y):
+    def key(seaweed):
+        cost = (((seaweed.rect.centerx - x)**2 + (seaweed.rect.centery - y)**2)**0.5 * aq.SeaweedIndex.DISTANCE_COST +
+                claims.get(seaweed, 0) * aq.SeaweedIndex.CLAIM_COST)
+        return cost, seaweed.id
+    return min(seaweed_list, key=key, default=None)
+
+
+@pytest.mark.parametrize("count, spread", [(200, 800), (12, 800), (40, 90)], ids=["many", "few", "clustered"])
+def test_seaweed_index_matches_linear_scan(count, spread):
+    rng = random.Random(count)
+    index = aq.SeaweedIndex()
+    seaweed_list = [aq.Seaweed(rng.uniform(0, spread), rng.uniform(0, spread)) for _ in range(count)]
+    for seaweed in seaweed_list:
+        index.add(seaweed)
+    # Pile claims onto a few seaweed so claim costs outweigh distance
+    fish = [Claimant() for _ in range(count * 2)]
+    for claimant in fish:
+        index.retarget(claimant, rng.choice(seaweed_list[:max(3, count // 4)]))
+    removed = seaweed_list[::5]
+    for seaweed in removed:
+        index.remove(seaweed)
+    seaweed_list = [seaweed for seaweed in seaweed_list if seaweed not in removed]
+    for claimant in fish[::3]:
+        index.retarget(claimant, rng.choice(seaweed_list + [None]))
+    claims = {}
+    for claimant in fish:
+        if claimant.target_seaweed is not None:
+            claims[claimant.target_seaweed] = claims.get(claimant.target_seaweed, 0) + 1
+    assert {seaweed: len(claimants) for seaweed, claimants in index.claims.items()} == claims
+
+    for _ in range(300):
+        x, y = rng.uniform(-100, 900), rng.uniform(-100, 700)
+        assert index.nearest(x, y) is nearest_by_scan(seaweed_list, claims, x, y)
+        rect = pygame.Rect(x, y, rng.randint(1, 80), rng.randint(1, 60))
+        hits = [seaweed for seaweed in seaweed_list if rect.colliderect(seaweed.rect)]
+        assert index.colliding(rect) is min(hits, key=lambda seaweed: seaweed.id, default=None)
+
+
+def test_removing_seaweed_drops_its_claims():
+    index = aq.SeaweedIndex()
+    near, far = aq.Seaweed(10, 10), aq.Seaweed(500, 500)
+    index.add(near)
+    index.add(far)
+    fish = [Claimant() for _ in range(3)]
+    for claimant in fish:
+        index.retarget(claimant, near)
+    assert index.least_claims() == 0
+    index.remove(near)
+    assert all(claimant.target_seaweed is None for claimant in fish)
+    assert index.claims == {} and index.nearest(0, 0) is far
+
+
+class Body:
+    """Just enough of a fish for FishGrid"""
+
+    def __init__(self, x, y, width, height):
+        self.rect = pygame.Rect(x, y, width, height)
+
+
+@pytest.mark.parametrize("count", [1, 30, 400])
+def test_fish_grid_matches_linear_scan(count):
+    rng = random.Random(count)
+    fish = [Body(rng.uniform(-20, 800), rng.uniform(-20, 600), rng.randint(4, 90), rng.randint(4, 60))
+            for _ in range(count)]
+    grid = aq.FishGrid()
+    grid.rebuild(fish)
+
+    for _ in range(300):
+        x, y = rng.randint(-30, 830), rng.randint(-30, 630)
+        assert grid.pick(x, y) is next((body for body in fish if body.rect.collidepoint(x, y)), None)
+    # Every spot inside a fish picks that fish or one listed before it
+    for i, body in enumerate(fish):
+        assert fish.index(grid.pick(*body.rect.center)) <= i
+
+    for radius in (grid.cell_size, 25, 130):
+        expected = {}
+        for i, a in enumerate(fish):
+            for j in range(i + 1, len(fish)):
+                dx = fish[j].rect.centerx - a.rect.centerx
+                dy = fish[j].rect.centery - a.rect.centery
+                if dx * dx + dy * dy <= radius * radius:
+                    expected[i, j] = (dx, dy)
+        found = {}
+        for a, b, dx, dy in grid.pairs(radius):
+            i, j = fish.index(a), fish.index(b)
+            key, offset = ((i, j), (dx, dy)) if i < j else ((j, i), (-dx, -dy))
+            assert key not in found  # Once per pair
+            found[key] = offset
+        assert found == expected
+
+
+def test_entity_store_swap_removal_pool_and_order():
+    aq.Seaweed._id_counter = 0
+    store = aq.EntityStore(pool_size=2)
+    seaweed = [store.make(aq.Seaweed, i * 10, 0) for i in range(6)]
+    for item in seaweed:
+        store.add(item)
+    ordered = store.in_order()
+    assert store.in_order() is ordered  # Cached until the store changes
+
+    store.remove(seaweed[1])
+    store.remove(seaweed[5])  # The last item: nothing to swap in
+    store.remove(seaweed[2])
+    assert len(store) == 3 and set(store) == {seaweed[0], seaweed[3], seaweed[4]}
+    assert seaweed[1] not in store and store.get(seaweed[1].id) is None
+    for item in store:
+        assert item in store and store.get(item.id) is item
+    assert [item.id for item in store.in_order()] == [0, 3, 4]
+
+    # Removed entities wait for release() before they can be reused, and
+    # only pool_size of them are kept
+    assert store.make(aq.Seaweed, 0, 0).id == 6
+    store.release()
+    assert store.spares == [seaweed[1], seaweed[5]]
+    reused = store.make(aq.Seaweed, 70, 80, True)
+    assert reused is seaweed[5] and reused.id == 7 and reused.rect.topleft == (70, 80) and reused.reserved
+    store.add(reused)
+    assert reused in store and [item.id for item in store.in_order()] == [0, 3, 4, 7]
+    # A stale reference to the old id doesn't find the reused object
+    assert store.get(5) is None
+
+
+def test_timer_scheduler_skips_stale_events(make_tank):
+    game = make_tank("objects", fish=0)
+    timers, clock = game.timers, game.sim_clock
+    fish = game.create_fish(100, 100)
+    fish.hunger = 20
+    game.add_fish(fish)
+    turns_hungry = 10 / fish.hunger_per_second
+
+    # Eating halfway there reschedules the fish, so the queued crossing goes stale
+    clock.advance(turns_hungry / 2)
+    fish.hunger = 0
+    clock.advance(turns_hungry / 2 + 0.01)
+    assert timers.run(clock.now) == 0
+    assert fish not in timers.hungry and fish not in timers.digesting
+
+    # Its replacement fires at the new crossing
+    clock.advance(30 / fish.hunger_per_second - turns_hungry / 2)
+    assert timers.run(clock.now) == 1
+    assert fish in timers.hungry and fish not in timers.starving
+
+    # A removed fish's events are all stale, even once the pool hands its
+    # object to a new fish
+    fish.hunger = 140
+    game.remove_fish(fish)
+    game.release_removed()
+    reborn = game.create_fish(200, 200)
+    assert reborn is fish
+    reborn.hunger = 0
+    game.add_fish(reborn)
+    clock.advance(20 / reborn.hunger_per_second)  # Past the old fish's starving time
+    timers.run(clock.now)
+    assert reborn not in timers.hungry and reborn not in timers.starving